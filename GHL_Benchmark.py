@@ -0,0 +1,257 @@
+import gc
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+from datetime import datetime
+
+from POS_Simulator import GHLProtocol, POSApp
+from GHL_payload_Translator import GHLParser
+
+# --- SETTINGS ---
+BASELINE_FILE = "benchmark_baseline.json"
+DEFAULT_THRESHOLD = 0.25 # Fail when a benchmark is more than 25% slower than its baseline
+CORPUS_SIZE = 2000
+CORPUS_SEED = 1017
+REPEATS = 5
+MIN_PASS_SEC = 0.2 # A pass loops over the corpus until it has run at least this long
+ROUND_TRIPS = 50
+
+# --- SYNTHETIC CORPUS ---
+# Fixed seed so every run (and every machine) times exactly the same frames
+class Corpus:
+    def __init__(self, size=CORPUS_SIZE, seed=CORPUS_SEED):
+        rnd = random.Random(seed)
+        self.proto = GHLProtocol()
+        self.requests = []      # (cmd, amt, inv, cshr)
+        self.req_packets = []
+        self.resp_packets = []
+        for n in range(size):
+            cmd = rnd.choice(["020", "022", "026", "050"])
+            amt = rnd.randint(1, 99999999) / 100
+            inv = rnd.randint(0, 999999)
+            cshr = str(rnd.randint(1, 9999))
+            self.requests.append((cmd, amt, inv, cshr))
+            self.req_packets.append(self.proto.build_packet(cmd, amt, inv, cshr))
+            self.resp_packets.append(self.response(rnd, n, short=(n % 10 == 0)))
+        self.req_payloads = [p[1:-9] for p in self.req_packets]
+        self.resp_payloads = [p[1:-9] for p in self.resp_packets]
+        self.chk_inputs = self.req_payloads + self.resp_payloads
+        # Log lines as the simulator writes them
+        self.log_lines = [f"[11:50:{n % 60:02d}] {'TX >' if n % 2 == 0 else 'RX <'} {p.hex().upper()}"
+                          for n, p in enumerate(p for pair in zip(self.req_packets, self.resp_packets) for p in pair)]
+
+    def response(self, rnd, n, short=False):
+        card = f"{rnd.randint(400000, 599999)}XXXXXX{rnd.randint(1000, 9999)}"
+        amt = rnd.randint(1, 99999999)
+        body = ("021" + rnd.choice(["00", "00", "00", "51", "05"])
+                + f"{len(card):02d}{card:<20}" + f"{rnd.randint(25, 35):02d}{rnd.randint(1, 12):02d}"
+                + rnd.choice(list(GHLParser.CARD_TYPES)) + f"{rnd.randint(0, 999999):08d}"
+                + f"{amt:012d}{amt:012d}" + f"{n % 1000000:06d}{rnd.randint(0, 999999):06d}"
+                + f"{rnd.randint(1, 9999):>4}" + f"{'VISA CREDIT':<15}")
+        if not short: # Every tenth frame mimics pre-v1.0.17 firmware
+            body += f"TID{n % 50:05d}" + f"MID{rnd.randint(0, 10**12):012d}" + f"{rnd.randint(1, 999):06d}"
+        payload = body.encode("ascii")
+        return b"\x02" + payload + self.proto.calculate_chk(payload) + b"\x03"
+
+# --- BENCHMARKS ---
+# Each returns (seconds, ops) for one sweep of the corpus; run() repeats sweeps
+# into passes of MIN_PASS_SEC and keeps the best of REPEATS passes
+def bench_build_packet(c):
+    build = c.proto.build_packet
+    t0 = time.perf_counter()
+    for cmd, amt, inv, cshr in c.requests:
+        build(cmd, amt, inv, cshr)
+    return time.perf_counter() - t0, len(c.requests)
+
+def bench_calculate_chk(c):
+    chk = c.proto.calculate_chk
+    t0 = time.perf_counter()
+    for p in c.chk_inputs:
+        chk(p)
+    return time.perf_counter() - t0, len(c.chk_inputs)
+
+def bench_parse_hex_string(c):
+    parse = GHLParser.parse_hex_string
+    t0 = time.perf_counter()
+    for line in c.log_lines:
+        parse(line)
+    return time.perf_counter() - t0, len(c.log_lines)
+
+def bench_parse_request(c):
+    parse = GHLParser.parse_request
+    t0 = time.perf_counter()
+    for p in c.req_payloads:
+        parse(p)
+    return time.perf_counter() - t0, len(c.req_payloads)
+
+def bench_parse_response(c):
+    parse = GHLParser.parse_response
+    t0 = time.perf_counter()
+    for p in c.resp_payloads:
+        parse(p)
+    return time.perf_counter() - t0, len(c.resp_payloads)
+
+def bench_receipt_fields(c):
+    fields = POSApp.receipt_fields
+    t0 = time.perf_counter()
+    for p in c.resp_payloads:
+        fields(p)
+    return time.perf_counter() - t0, len(c.resp_payloads)
+
+class PtyRoundTrip:
+    # Sale request -> emulated terminal -> 021, through GHLProtocol on a pty
+    def __init__(self):
+        from GHL_Terminal_Emulator import PtyTerminal
+        self.term = PtyTerminal().start()
+        self.proto = GHLProtocol()
+        ok, msg = self.proto.connect(self.term.port)
+        if not ok:
+            raise RuntimeError(msg)
+
+    def __call__(self, c):
+        packets = c.req_packets[:ROUND_TRIPS]
+        t0 = time.perf_counter()
+        for pkt in packets:
+            data, logs = self.proto.transact(pkt, 5)
+            if data is None:
+                raise RuntimeError(logs[-1] if logs else "No response")
+        return time.perf_counter() - t0, len(packets)
+
+    def close(self):
+        self.proto.disconnect()
+        self.term.stop()
+
+BENCHMARKS = [
+    ("build_packet", bench_build_packet),
+    ("calculate_chk", bench_calculate_chk),
+    ("parse_hex_string", bench_parse_hex_string),
+    ("parse_request", bench_parse_request),
+    ("parse_response", bench_parse_response),
+    ("receipt_fields", bench_receipt_fields),
+    ("pty_round_trip", None), # Needs a pty, set up on demand
+]
+
+def timed_pass(fn, corpus, min_secs=MIN_PASS_SEC):
+    # Short sweeps are dominated by timer and scheduler noise
+    secs, ops = 0.0, 0
+    while secs < min_secs:
+        s, n = fn(corpus)
+        secs += s
+        ops += n
+    return secs, ops
+
+def run(names, repeats=REPEATS):
+    corpus = Corpus()
+    results = {}
+    active = [] # (name, fn)
+    closers = []
+    for name, fn in BENCHMARKS:
+        if names and name not in names:
+            continue
+        if name == "pty_round_trip":
+            if os.name != "posix":
+                results[name] = {"skipped": "needs a POSIX pty"}
+                continue
+            fn = PtyRoundTrip()
+            closers.append(fn.close)
+        results[name] = None
+        active.append((name, fn))
+
+    best = {} # name -> (secs, ops) of the fastest pass
+    gc_was_enabled = gc.isenabled()
+    try:
+        for name, fn in active:
+            fn(corpus) # Warm-up, discarded: caches, lazy imports, first pty reads
+        gc.disable()
+        # Rounds interleave the benchmarks, so a slow spell on the machine
+        # costs each benchmark one pass instead of all of one benchmark's passes
+        for _ in range(repeats):
+            for name, fn in active:
+                secs, ops = timed_pass(fn, corpus)
+                if name not in best or secs / ops < best[name][0] / best[name][1]:
+                    best[name] = (secs, ops)
+    finally:
+        if gc_was_enabled: gc.enable()
+        for close in closers: close()
+
+    for name, (secs, ops) in best.items():
+        results[name] = {
+            "ops": ops,
+            "us_per_op": round(secs / ops * 1e6, 3),
+            "ops_per_sec": round(ops / secs, 1),
+        }
+    return results
+
+def compare(results, baseline, threshold, overrides):
+    # Returns [(name, baseline_us, current_us, change, limit)] for every regression
+    regressions = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        if "us_per_op" not in res or not base or "us_per_op" not in base:
+            continue
+        change = res["us_per_op"] / base["us_per_op"] - 1
+        res["change"] = round(change, 3)
+        limit = overrides.get(name, threshold)
+        if change > limit:
+            regressions.append((name, base["us_per_op"], res["us_per_op"], change, limit))
+    return regressions
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark the GHL protocol hot paths against a stored baseline")
+    ap.add_argument("--baseline", default=BASELINE_FILE, help="Baseline JSON to compare with / save to")
+    ap.add_argument("--save", action="store_true", help="Store this run as the new baseline")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown as a fraction (0.25 = 25%%)")
+    ap.add_argument("--limit", action="append", default=[], metavar="NAME=FRACTION", help="Per-benchmark threshold (repeatable)")
+    ap.add_argument("--only", nargs="+", metavar="NAME", help="Run only these benchmarks")
+    ap.add_argument("--repeats", type=int, default=REPEATS)
+    ap.add_argument("--output", help="Also write this run's results as JSON")
+    ap.add_argument("--require-baseline", action="store_true", help="Fail (exit 1) when there is no baseline to compare with")
+    args = ap.parse_args(argv)
+
+    overrides = {}
+    for item in args.limit:
+        name, _, frac = item.partition("=")
+        overrides[name] = float(frac)
+
+    results = run(args.only, args.repeats)
+    doc = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "corpus": {"size": CORPUS_SIZE, "seed": CORPUS_SEED},
+        },
+        "results": results,
+    }
+
+    regressions = []
+    missing = not args.save and not os.path.exists(args.baseline)
+    if missing:
+        print(f"WARNING: no baseline at {args.baseline}, nothing compared (save one with --save)", file=sys.stderr)
+    elif not args.save:
+        with open(args.baseline, "r") as f: baseline = json.load(f).get("results", {})
+        regressions = compare(results, baseline, args.threshold, overrides)
+
+    for name, res in results.items():
+        if "skipped" in res:
+            print(f"{name:<18} skipped ({res['skipped']})")
+            continue
+        change = f"{res['change']:+.1%}" if "change" in res else ""
+        print(f"{name:<18} {res['us_per_op']:>10.3f} us/op {res['ops_per_sec']:>12.1f} ops/s  {change}")
+
+    if args.output:
+        with open(args.output, "w") as f: json.dump(doc, f, indent=2)
+    if args.save:
+        with open(args.baseline, "w") as f: json.dump(doc, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+    for name, base, cur, change, limit in regressions:
+        print(f"REGRESSION {name}: {base:.3f} -> {cur:.3f} us/op ({change:+.1%}, limit {limit:+.0%})")
+    return 1 if regressions or (missing and args.require_baseline) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+import re
+import sys
+import time
+import json
+import argparse
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from concurrent.futures import ThreadPoolExecutor
+
+from POS_Simulator import GHLProtocol, RESP_TIMEOUT
+from GHL_payload_Translator import GHLParser
+
+# Optional: scenarios may also be written in YAML
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# --- SCENARIO FORMAT ---
+# {
+#   "name": "sale-void-refund-settle",
+#   "lanes": [{"port": "COM3", "cashier": "99"}, {"port": "COM4"}],
+#   "steps": [
+#     {"id": "sale",   "cmd": "020", "amount": 12.50},
+#     {"id": "void",   "cmd": "022", "invoice": "${sale.invoice_trace}"},
+#     {"id": "refund", "cmd": "026", "amount": "${sale.gross_amount}", "invoice": "${sale.@71:6}"},
+#     {"id": "settle", "cmd": "050", "expect": "00"}
+#   ]
+# }
+# ${step.field} pulls a GHLParser.parse_response field from an earlier step,
+# ${step.@offset:length} slices the raw response payload (e.g. @71:6 = invoice).
+
+REF_RE = re.compile(r"\$\{(\w+)\.(?:@(\d+):(\d+)|(\w+))\}")
+
+class ScenarioError(Exception):
+    pass
+
+def load_scenario(path):
+    with open(path, "r") as f:
+        text = f.read()
+    if path.lower().endswith((".yaml", ".yml")):
+        if yaml is None:
+            raise ScenarioError("PyYAML is required for YAML scenarios (pip install pyyaml)")
+        scenario = yaml.safe_load(text)
+    else:
+        scenario = json.loads(text)
+    if not scenario.get("steps"):
+        raise ScenarioError(f"{path}: scenario has no steps")
+    return scenario
+
+def resolve(value, done):
+    # done: step id -> {"payload": bytes, "fields": dict}
+    if not isinstance(value, str):
+        return value
+    def sub(m):
+        step = done.get(m.group(1))
+        if step is None:
+            raise ScenarioError(f"Reference to unknown or failed step: {m.group(0)}")
+        if m.group(4):
+            if m.group(4) not in step["fields"]:
+                raise ScenarioError(f"Step '{m.group(1)}' has no field '{m.group(4)}'")
+            return str(step["fields"][m.group(4)])
+        start, length = int(m.group(2)), int(m.group(3))
+        return step["payload"][start:start + length].decode("ascii", errors="ignore").strip()
+    return REF_RE.sub(sub, value)
+
+def parse_amount(value):
+    # Decimal, not float: 1.13 as a float is 1.12999... and would lose a cent
+    try:
+        return Decimal(str(value or 0))
+    except InvalidOperation:
+        raise ValueError(f"amount {value!r} is not a number")
+
+# --- LANE RUNNER ---
+class LaneRunner:
+    def __init__(self, lane, steps, timeout=RESP_TIMEOUT, stop_on_fail=True):
+        self.lane = lane
+        self.steps = steps
+        self.timeout = timeout
+        self.stop_on_fail = stop_on_fail
+        self.proto = GHLProtocol()
+
+    def run_step(self, n, step, done):
+        sid = step.get("id", f"step{n}")
+        res = {"id": sid, "cmd": step.get("cmd"), "ok": False}
+        try:
+            if step.get("delay_before"):
+                time.sleep(float(step["delay_before"]))
+            cmd = str(step["cmd"])
+            amt = parse_amount(resolve(step.get("amount", 0), done))
+            inv = int(resolve(step.get("invoice", 0), done) or 0)
+            cshr = resolve(step.get("cashier", self.lane.get("cashier", "99")), done)
+            pkt = self.proto.build_packet(cmd, amt, inv, cshr)
+        except (ScenarioError, KeyError, ValueError) as e:
+            res["error"] = f"Bad step: {e}"
+            return sid, res, None
+
+        res["tx"] = pkt.hex().upper()
+        t0 = time.perf_counter()
+        data, logs = self.proto.transact(pkt, float(step.get("timeout", self.timeout)))
+        res["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+
+        if data is None:
+            res["error"] = logs[-1] if logs else "No response"
+            return sid, res, None
+
+        res["rx"] = data.hex().upper()
+        payload = data[1:-9]
+        fields = GHLParser.parse_response(payload)
+        res["error_code"] = fields.get("error_code")
+        res["fields"] = fields
+
+        expect = step.get("expect", "00")
+        res["ok"] = expect is None or res["error_code"] == expect
+        if not res["ok"]:
+            res["error"] = f"Expected {expect}, got {res['error_code']}"
+        return sid, res, {"payload": payload, "fields": fields}
+
+    def run(self):
+        report = {"port": self.lane["port"], "ok": False, "steps": []}
+        t0 = time.perf_counter()
+        ok, msg = self.proto.connect(self.lane["port"])
+        if not ok:
+            report["error"] = msg
+            return report
+        try:
+            done = {}
+            all_ok = True
+            for n, step in enumerate(self.steps, 1):
+                sid, res, ctx = self.run_step(n, step, done)
+                report["steps"].append(res)
+                if ctx is not None:
+                    done[sid] = ctx
+                if not res["ok"]:
+                    all_ok = False
+                    if self.stop_on_fail:
+                        break
+            report["ok"] = all_ok and len(report["steps"]) == len(self.steps)
+        finally:
+            self.proto.disconnect()
+            report["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        return report
+
+def run_scenario(scenario, lanes):
+    steps = scenario["steps"]
+    timeout = float(scenario.get("timeout", RESP_TIMEOUT))
+    stop_on_fail = scenario.get("stop_on_fail", True)
+
+    started = datetime.now().isoformat(timespec="seconds")
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, len(lanes))) as pool:
+        runs = [LaneRunner(lane, steps, timeout, stop_on_fail) for lane in lanes]
+        reports = list(pool.map(lambda r: r.run(), runs))
+
+    return {
+        "scenario": scenario.get("name", "unnamed"),
+        "started": started,
+        "wall_ms": round((time.perf_counter() - t0) * 1000, 1),
+        "ok": all(r["ok"] for r in reports),
+        "lanes": reports,
+    }
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run a GHL transaction scenario headless across one or more lanes")
+    ap.add_argument("scenario", help="Scenario file (.json, or .yaml with PyYAML)")
+    ap.add_argument("--ports", nargs="+", help="Override the scenario's lanes with these ports")
+    ap.add_argument("--pty", type=int, metavar="N", help="Run against N emulated terminals on pseudo terminals")
+    ap.add_argument("--report", help="Write the JSON report here instead of stdout")
+    args = ap.parse_args(argv)
+
+    scenario = load_scenario(args.scenario)
+    lanes = scenario.get("lanes", [])
+    terms = []
+    if args.pty:
+        from GHL_Terminal_Emulator import PtyTerminal
+        terms = [PtyTerminal().start() for _ in range(args.pty)]
+        lanes = [{"port": t.port} for t in terms]
+    elif args.ports:
+        lanes = [{"port": p} for p in args.ports]
+    if not lanes:
+        ap.error("No lanes: add \"lanes\" to the scenario or pass --ports / --pty")
+
+    try:
+        report = run_scenario(scenario, lanes)
+    finally:
+        for t in terms: t.stop()
+
+    out = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, "w") as f: f.write(out)
+    else:
+        print(out)
+    return 0 if report["ok"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
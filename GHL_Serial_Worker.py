@@ -0,0 +1,257 @@
+import sys
+import time
+import secrets
+import argparse
+import threading
+import itertools
+import multiprocessing
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+
+from POS_Simulator import GHLProtocol, RESP_TIMEOUT
+
+# --- SERIAL WORKER ---
+# Serial I/O and framing run in their own process, so Tk work in the
+# GUI (receipts, big log inserts) never competes with the reader thread for the
+# GIL. GUIs and headless clients talk to it over a local authenticated socket
+# (multiprocessing.connection); several can attach at once, transactions are
+# serialized on the single port.
+WORKER_ADDRESS = ("127.0.0.1", 50917) # Default for a shared worker; a private one binds a free port
+WORKER_START_TIMEOUT = 10
+
+class WorkerServer:
+    def __init__(self, address, authkey):
+        self.address = address
+        self.authkey = authkey
+        self.proto = GHLProtocol()
+        self.port = None
+        self.busy = False
+        self.lock = threading.Lock()      # Guards conn.send
+        self.busy_lock = threading.Lock() # Guards the check-and-set of busy
+        self.clients = []
+
+    def send_to(self, conn, msg):
+        try:
+            with self.lock:
+                conn.send(msg)
+        except (OSError, EOFError):
+            pass
+
+    def broadcast(self, msg):
+        for conn in list(self.clients):
+            self.send_to(conn, msg)
+
+    def state(self):
+        return {"ev": "state", "connected": self.proto.is_connected(), "port": self.port, "busy": self.busy}
+
+    def handle(self, conn, req):
+        op = req.get("op")
+        rid = req.get("id")
+
+        if op == "connect":
+            if self.busy:
+                self.send_to(conn, {"ev": "reply", "id": rid, "ok": False, "msg": "Terminal busy"})
+                return
+            ok, msg = self.proto.connect(req["port"])
+            self.port = req["port"] if ok else None
+            self.send_to(conn, {"ev": "reply", "id": rid, "ok": ok, "msg": msg})
+            self.broadcast(self.state())
+        elif op == "disconnect":
+            self.proto.disconnect()
+            self.port = None
+            self.send_to(conn, {"ev": "reply", "id": rid, "ok": True, "msg": "Disconnected"})
+            self.broadcast(self.state())
+        elif op == "cancel":
+            self.proto.cancel_wait()
+            self.send_to(conn, {"ev": "reply", "id": rid, "ok": True, "msg": ""})
+        elif op == "status":
+            self.send_to(conn, dict(self.state(), ev="reply", id=rid, ok=True, msg=""))
+        elif op == "send":
+            with self.busy_lock:
+                was_busy = self.busy
+                self.busy = True
+            if was_busy:
+                self.send_to(conn, {"ev": "msg", "id": rid, "msg": "Err: Terminal busy", "data": None, "final": True})
+                return
+
+            def cb(msg, data):
+                final = not msg.startswith("TX")
+                ev = {"ev": "msg", "id": rid, "msg": msg, "data": data, "final": final}
+                if final:
+                    self.busy = False
+                self.send_to(conn, ev)
+            self.proto.send_recv(req["packet"], cb, req.get("timeout", RESP_TIMEOUT))
+        else:
+            self.send_to(conn, {"ev": "reply", "id": rid, "ok": False, "msg": f"Unknown op: {op}"})
+
+    def client_loop(self, conn):
+        self.clients.append(conn)
+        self.send_to(conn, self.state())
+        try:
+            while True:
+                self.handle(conn, conn.recv())
+        except (EOFError, OSError):
+            pass
+        finally:
+            self.clients.remove(conn)
+            conn.close()
+
+    def serve(self, port=None, ready=None):
+        if port:
+            ok, msg = self.proto.connect(port)
+            self.port = port if ok else None
+            print(msg, flush=True)
+        with Listener(self.address, authkey=self.authkey) as listener:
+            if ready is not None:
+                # Tell the parent which port the OS picked
+                ready.send(listener.address)
+                ready.close()
+            while True:
+                try:
+                    conn = listener.accept()
+                except (AuthenticationError, OSError, EOFError):
+                    continue # Wrong key or a dropped handshake: refuse that client only
+                threading.Thread(target=self.client_loop, args=(conn,), daemon=True).start()
+
+def run_worker(address, authkey, port=None, ready=None):
+    WorkerServer(address, authkey).serve(port, ready)
+
+def start_worker():
+    # Private worker for one GUI: a free port and a one-off key, so it can
+    # neither collide with nor be reached by anything else on the machine.
+    # Returns (process, address, authkey).
+    authkey = secrets.token_bytes(32)
+    ours, theirs = multiprocessing.Pipe(duplex=False)
+    proc = multiprocessing.Process(target=run_worker, args=(("127.0.0.1", 0), authkey, None, theirs), daemon=True)
+    proc.start()
+    theirs.close()
+    try:
+        if not ours.poll(WORKER_START_TIMEOUT):
+            raise RuntimeError("Serial worker did not start")
+        address = ours.recv()
+    except EOFError:
+        raise RuntimeError("Serial worker exited during start-up")
+    finally:
+        ours.close()
+    return proc, address, authkey
+
+# --- CLIENT ---
+class WorkerProtocol(GHLProtocol):
+    # Drop-in for GHLProtocol (same connect/send_recv/cancel_wait surface) that
+    # forwards to a WorkerServer; callbacks arrive on the client's reader thread.
+    def __init__(self, address, authkey, connect_timeout=10):
+        super().__init__()
+        self.conn = self.open(address, authkey, connect_timeout)
+        self.send_lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.callbacks = {}
+        self.sent = set() # Request ids the worker has already written to the terminal
+        self.replies = {}
+        self.connected = False
+        self.port = None
+        self.busy = False
+        threading.Thread(target=self.reader, daemon=True).start()
+
+    @staticmethod
+    def open(address, authkey, timeout):
+        # The worker may still be starting up
+        deadline = time.time() + timeout
+        while True:
+            try:
+                return Client(address, authkey=authkey)
+            except (ConnectionRefusedError, OSError):
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.1)
+
+    def reader(self):
+        try:
+            while True:
+                ev = self.conn.recv()
+                kind = ev.get("ev")
+                if kind == "state":
+                    self.connected, self.port, self.busy = ev["connected"], ev["port"], ev["busy"]
+                elif kind == "reply":
+                    slot = self.replies.get(ev["id"])
+                    if slot:
+                        slot[1] = ev
+                        slot[0].set()
+                elif kind == "msg":
+                    cb = self.callbacks.get(ev["id"])
+                    if ev["msg"].startswith("TX"):
+                        self.sent.add(ev["id"])
+                    if ev.get("final"):
+                        self.callbacks.pop(ev["id"], None)
+                        self.sent.discard(ev["id"])
+                        self.in_flight = bool(self.callbacks)
+                    if cb:
+                        cb(ev["msg"], ev["data"])
+        except (EOFError, OSError):
+            self.connected = False
+            for rid, cb in list(self.callbacks.items()):
+                # Once the request went out the terminal may have acted on it
+                cb("Err: Worker connection lost after send" if rid in self.sent else "Err: Worker connection lost", None)
+            self.callbacks.clear()
+            self.sent.clear()
+
+    def post(self, req):
+        with self.send_lock:
+            self.conn.send(req)
+
+    def request(self, op, timeout=10, **kw):
+        rid = next(self.ids)
+        slot = self.replies[rid] = [threading.Event(), None]
+        self.post(dict(kw, op=op, id=rid))
+        slot[0].wait(timeout)
+        self.replies.pop(rid, None)
+        return slot[1] or {"ok": False, "msg": "Worker did not reply"}
+
+    def connect(self, port):
+        rep = self.request("connect", port=port)
+        if rep["ok"]:
+            self.connected, self.port = True, port
+        return rep["ok"], rep["msg"]
+
+    def disconnect(self):
+        try:
+            self.request("disconnect", timeout=2)
+        except (OSError, EOFError):
+            pass
+        self.connected = False
+
+    def is_connected(self):
+        return self.connected
+
+    def detach(self):
+        # Leave the worker (and its port) running for the other clients
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+
+    def cancel_wait(self):
+        self.request("cancel", timeout=2)
+
+    def send_recv(self, packet, cb, timeout=RESP_TIMEOUT):
+        if not self.connected:
+            cb("Err: Disconnected", None)
+            return
+        rid = next(self.ids)
+        self.callbacks[rid] = cb
+        self.in_flight = True
+        self.post({"op": "send", "id": rid, "packet": packet, "timeout": timeout})
+
+def parse_address(text):
+    host, _, port = text.rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Serial I/O worker process for the GHL simulator")
+    ap.add_argument("--listen", default=f"{WORKER_ADDRESS[0]}:{WORKER_ADDRESS[1]}", help="HOST:PORT for clients")
+    ap.add_argument("--authkey", required=True, help="Shared secret clients must present")
+    ap.add_argument("--port", help="Serial port to open on start")
+    args = ap.parse_args()
+    try:
+        run_worker(parse_address(args.listen), args.authkey.encode(), args.port)
+    except KeyboardInterrupt:
+        sys.exit(0)
@@ -0,0 +1,213 @@
+import sys
+import time
+import json
+import random
+import argparse
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from POS_Simulator import GHLProtocol, RESP_TIMEOUT
+from GHL_payload_Translator import GHLParser
+
+# --- FLEET CONFIG ---
+# {
+#   "terminals": [{"port": "COM3", "name": "Lane 1", "cashier": "99"}, {"port": "COM4"}],
+#   "concurrency": 4,               # Settlements running at the same time
+#   "windows": ["23:30-01:00"],     # Local time ranges a settlement may START in (may wrap midnight)
+#   "stagger": 2,                   # Seconds between consecutive starts
+#   "retries": 3,                   # Extra attempts after the first
+#   "backoff": 30, "backoff_max": 300,
+#   "timeout": 120                  # Seconds to wait for each 051
+# }
+DEFAULTS = {
+    "concurrency": 4,
+    "windows": [],
+    "stagger": 0.0,
+    "retries": 2,
+    "backoff": 30.0,
+    "backoff_max": 300.0,
+    "timeout": RESP_TIMEOUT,
+}
+
+def parse_window(text):
+    start, end = text.split("-")
+    to_min = lambda hm: int(hm.split(":")[0]) * 60 + int(hm.split(":")[1])
+    return to_min(start), to_min(end)
+
+def in_windows(windows, now=None):
+    if not windows:
+        return True
+    now = now or datetime.now()
+    minute = now.hour * 60 + now.minute
+    for start, end in windows:
+        if start <= end and start <= minute < end:
+            return True
+        if start > end and (minute >= start or minute < end): # Wraps midnight
+            return True
+    return False
+
+def seconds_until_window(windows, now=None):
+    now = now or datetime.now()
+    if in_windows(windows, now):
+        return 0
+    base = now.replace(second=0, microsecond=0)
+    for m in range(1, 24 * 60 + 1):
+        if in_windows(windows, base + timedelta(minutes=m)):
+            return (base + timedelta(minutes=m) - now).total_seconds()
+    return None
+
+# --- SCHEDULER ---
+class SettlementScheduler:
+    def __init__(self, terminals, **opts):
+        cfg = dict(DEFAULTS, **{k: v for k, v in opts.items() if v is not None})
+        self.terminals = terminals
+        self.concurrency = max(1, int(cfg["concurrency"]))
+        self.windows = [parse_window(w) for w in cfg["windows"]]
+        self.stagger = float(cfg["stagger"])
+        self.retries = int(cfg["retries"])
+        self.backoff = float(cfg["backoff"])
+        self.backoff_max = float(cfg["backoff_max"])
+        self.timeout = float(cfg["timeout"])
+        self.wait_for_window = cfg.get("wait_for_window", True)
+        self.start_lock = threading.Lock()
+        self.last_start = 0.0
+        self.opened = False # Set once the run has been inside the window
+
+    def wait_turn(self):
+        # Spread starts out so the acquirer is not hit by the whole fleet at once
+        with self.start_lock:
+            gap = self.last_start + self.stagger - time.monotonic()
+            if gap > 0:
+                time.sleep(gap)
+            self.last_start = time.monotonic()
+
+    def settle_once(self, proto, term):
+        pkt = proto.build_packet("050", 0.0, 0, term.get("cashier", "99"))
+        data, logs = proto.transact(pkt, self.timeout)
+        if data is None:
+            return None, logs[-1] if logs else "No response"
+        fields = GHLParser.parse_response(data[1:-9])
+        return fields, None
+
+    def settle(self, term):
+        res = {"port": term["port"], "name": term.get("name", term["port"]),
+               "ok": False, "attempts": 0}
+        t0 = time.perf_counter()
+        proto = GHLProtocol()
+        try:
+            for attempt in range(self.retries + 1):
+                # run() already waited for the window to open; if it has closed
+                # since (queued behind others, or retrying) give up until tomorrow
+                if not in_windows(self.windows):
+                    res["error"] = "Window closed" if attempt or self.opened else "Outside settlement window"
+                    break
+
+                self.wait_turn()
+                res["attempts"] = attempt + 1
+                res["started"] = datetime.now().isoformat(timespec="seconds")
+
+                ok, msg = proto.connect(term["port"])
+                if ok:
+                    fields, err = self.settle_once(proto, term)
+                    proto.disconnect()
+                else:
+                    fields, err = None, msg
+
+                if fields is not None:
+                    res["error_code"] = fields.get("error_code")
+                    res["terminal_id"] = fields.get("terminal_id", "N/A")
+                    res["batch_number"] = fields.get("batch_number", "N/A")
+                    res["settled_amount"] = fields.get("gross_amount")
+                    if res["error_code"] == "00":
+                        res["ok"] = True
+                        res.pop("error", None)
+                        break
+                    err = f"Declined: {res['error_code']}"
+                res["error"] = err
+
+                if attempt < self.retries:
+                    # Exponential backoff with jitter so retries do not line up again
+                    delay = min(self.backoff * (2 ** attempt), self.backoff_max) * random.uniform(0.8, 1.2)
+                    if not in_windows(self.windows, datetime.now() + timedelta(seconds=delay)):
+                        res["error"] = f"{err}; window closed before retry"
+                        break
+                    time.sleep(delay)
+        finally:
+            proto.disconnect()
+            res["duration_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        return res
+
+    def run(self):
+        started = datetime.now().isoformat(timespec="seconds")
+        t0 = time.perf_counter()
+        # Wait once, for the next opening only; terminals still queued when the
+        # window closes are reported instead of holding the run for a day
+        if not in_windows(self.windows) and self.wait_for_window:
+            wait = seconds_until_window(self.windows)
+            if wait:
+                time.sleep(wait)
+        self.opened = in_windows(self.windows)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            results = list(pool.map(self.settle, self.terminals))
+        ok = [r for r in results if r["ok"]]
+        return {
+            "started": started,
+            "wall_ms": round((time.perf_counter() - t0) * 1000, 1),
+            "terminals": len(results),
+            "settled": len(ok),
+            "failed": len(results) - len(ok),
+            "concurrency": self.concurrency,
+            "results": results,
+        }
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run end-of-day settlement (050) across a fleet of terminals")
+    ap.add_argument("--config", help="Fleet config JSON (terminals, concurrency, windows, retries, ...)")
+    ap.add_argument("--ports", nargs="+", help="Terminal ports (instead of the config's terminals)")
+    ap.add_argument("--pty", type=int, metavar="N", help="Settle N emulated terminals on pseudo terminals")
+    ap.add_argument("--concurrency", type=int)
+    ap.add_argument("--window", action="append", dest="windows", metavar="HH:MM-HH:MM", help="Allowed start window (repeatable)")
+    ap.add_argument("--stagger", type=float)
+    ap.add_argument("--retries", type=int)
+    ap.add_argument("--backoff", type=float)
+    ap.add_argument("--timeout", type=float)
+    ap.add_argument("--no-wait", action="store_true", help="Skip terminals instead of waiting when outside the window")
+    ap.add_argument("--report", help="Write the JSON summary here instead of stdout")
+    args = ap.parse_args(argv)
+
+    cfg = {}
+    if args.config:
+        with open(args.config, "r") as f: cfg = json.load(f)
+    terminals = cfg.pop("terminals", [])
+
+    terms = []
+    if args.pty:
+        from GHL_Terminal_Emulator import PtyTerminal
+        terms = [PtyTerminal().start() for _ in range(args.pty)]
+        terminals = [{"port": t.port} for t in terms]
+    elif args.ports:
+        terminals = [{"port": p} for p in args.ports]
+    if not terminals:
+        ap.error("No terminals: pass --config, --ports or --pty")
+
+    for key in ("concurrency", "windows", "stagger", "retries", "backoff", "timeout"):
+        if getattr(args, key) is not None:
+            cfg[key] = getattr(args, key)
+    if args.no_wait:
+        cfg["wait_for_window"] = False
+
+    try:
+        summary = SettlementScheduler(terminals, **cfg).run()
+    finally:
+        for t in terms: t.stop()
+
+    out = json.dumps(summary, indent=2)
+    if args.report:
+        with open(args.report, "w") as f: f.write(out)
+    else:
+        print(out)
+    return 0 if not summary["failed"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+import os
+import time
+import threading
+import argparse
+from datetime import datetime
+
+from POS_Simulator import GHLProtocol, STX, ETX
+
+# --- TERMINAL STAND-IN ---
+# Answers POS requests the way the A920 does once a card has been presented, so
+# scenarios, schedulers and benchmarks can run without hardware. POSIX only
+# (uses a pseudo terminal); point the simulator or any script at the printed path.
+
+# Request cmd -> response cmd
+RESPONSE_CMDS = {"020": "021", "022": "023", "026": "027", "050": "051"}
+
+class TerminalEmulator:
+    def __init__(self, terminal_id="TID00001", merchant_id="MID000000000001",
+                 card="411111XXXXXX1111", card_type="04", card_label="VISA CREDIT",
+                 delay=0.0, decline=None):
+        self.proto = GHLProtocol() # Only used for the check digit
+        self.terminal_id = terminal_id
+        self.merchant_id = merchant_id
+        self.card = card
+        self.card_type = card_type
+        self.card_label = card_label
+        self.delay = delay           # Simulated card interaction time (seconds)
+        self.decline = decline or {} # cmd -> error code to answer with
+        self.stan = 0
+        self.invoice = 0
+        self.batch = 1
+        self.sales = {}              # invoice -> amount (cents), for void/refund
+        self.lock = threading.Lock()
+
+    def handle(self, payload):
+        # payload = request without STX/check digit/ETX -> full response packet
+        req = payload.decode("ascii", errors="ignore")
+        cmd, amt, inv, cshr = req[0:3], req[3:15], req[15:21], req[21:25]
+        resp_cmd = RESPONSE_CMDS.get(cmd, "999")
+        err = self.decline.get(cmd, "00" if cmd in RESPONSE_CMDS else "99")
+
+        with self.lock:
+            self.stan += 1
+            amount = int(amt) if amt.isdigit() else 0
+            if cmd == "020" and err == "00":
+                self.invoice += 1
+                invoice = self.invoice
+                self.sales[invoice] = amount
+            elif cmd == "022":
+                # Void answers with the original sale amount
+                invoice = int(inv) if inv.isdigit() else 0
+                amount = self.sales.pop(invoice, 0)
+                if not amount and err == "00":
+                    err = "12" # No such transaction
+            elif cmd == "050":
+                invoice = 0
+                amount = sum(self.sales.values())
+                if err == "00":
+                    self.sales.clear()
+            else:
+                invoice = int(inv) if inv.isdigit() else 0
+            stan, batch = self.stan, self.batch
+            if cmd == "050" and err == "00":
+                self.batch += 1
+
+        auth = f"{stan:06d}".rjust(8) if err == "00" else " " * 8
+        resp = (
+            resp_cmd + err
+            + f"{len(self.card):02d}{self.card:<20}"
+            + datetime.now().strftime("%y%m")
+            + self.card_type
+            + auth
+            + f"{amount:012d}" + f"{amount:012d}"
+            + f"{stan:06d}" + f"{invoice:06d}"
+            + f"{cshr:>4}"
+            + f"{self.card_label:<15}"[:15]
+            + f"{self.terminal_id:<8}"[:8]
+            + f"{self.merchant_id:<15}"[:15]
+            + f"{batch:06d}"
+        ).encode("ascii")
+        return STX + resp + self.proto.calculate_chk(resp) + ETX
+
+class PtyTerminal:
+    # Serves one TerminalEmulator on a pseudo terminal from a background thread
+    def __init__(self, emulator=None):
+        import pty, tty
+        self.emulator = emulator or TerminalEmulator()
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        for fd in (self.master, self.slave):
+            try: os.close(fd)
+            except OSError: pass
+
+    def serve(self):
+        buff = bytearray()
+        while self.running:
+            try:
+                chunk = os.read(self.master, 4096)
+            except OSError:
+                return
+            buff.extend(chunk)
+            while True:
+                stx = buff.find(STX)
+                if stx == -1:
+                    buff.clear()
+                    break
+                del buff[:stx]
+                frame = self.take_frame(buff)
+                if frame is None:
+                    break
+                if self.emulator.delay:
+                    time.sleep(self.emulator.delay)
+                try:
+                    os.write(self.master, self.emulator.handle(frame[1:-9]))
+                except OSError:
+                    return
+
+    def take_frame(self, buff):
+        # First ETX whose check digit verifies closes the frame
+        pos = 11
+        while True:
+            etx = buff.find(ETX, pos - 1)
+            if etx == -1:
+                return None
+            frame = bytes(buff[:etx + 1])
+            if self.emulator.proto.frame_complete(frame):
+                del buff[:etx + 1]
+                return frame
+            pos = etx + 2
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="GHL terminal stand-in on a pseudo terminal")
+    ap.add_argument("--count", type=int, default=1, help="Number of emulated terminals")
+    ap.add_argument("--delay", type=float, default=0.0, help="Seconds each request takes (card interaction)")
+    args = ap.parse_args()
+
+    terms = [PtyTerminal(TerminalEmulator(terminal_id=f"TID{n:05d}", delay=args.delay)).start()
+             for n in range(1, args.count + 1)]
+    for t in terms:
+        print(t.port, flush=True)
+    try:
+        while True: time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for t in terms: t.stop()
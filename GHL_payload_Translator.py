@@ -1,7 +1,33 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import json
-from datetime import datetime
+import os
+import re
+import sys
+import time
+import argparse
+import binascii
+import gzip
+import lzma
+import bz2
+import mmap
+import csv
+from array import array
+from datetime import datetime, date, time as dtime
+
+# Optional: only needed for --bulk decoding
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Optional: only needed for Parquet / Arrow export
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
 
 # --- THEME CONSTANTS (MATCHING SIMULATOR) ---
 COL_BG_MAIN = "#F4F6F9"
@@ -22,6 +48,25 @@ FONT_LABEL = ("Segoe UI", 9, "bold")
 FONT_INPUT = ("Consolas", 11)
 FONT_BTN = ("Segoe UI", 10, "bold")
 
+# Follow mode
+FOLLOW_STATE_FILE = "translator_follow_state.json"
+FOLLOW_POLL_SEC = 0.5
+FOLLOW_READ_BYTES = 1024 * 1024
+
+# Batch mode
+BATCH_CHUNK_BYTES = 4 * 1024 * 1024
+
+# Columnar export
+EXPORT_CHUNK_ROWS = 65536
+
+# Bulk (vectorized) decoding
+BULK_BLOCK_FRAMES = 262144
+RESP_PAYLOAD_LEN = 125 # v1.0.17+ response payload; older firmware is padded to this
+
+# Output rendering
+RENDER_PAGE_FRAMES = 500    # Frames per output page
+RENDER_TAG_BATCH = 2000     # Ranges per tag_add call
+
 class GHLParser:
     CARD_TYPES = {
         "04": "VISA",
@@ -62,6 +107,14 @@ class GHLParser:
         except Exception as e:
             return {"error": f"Hex Conversion Error: {str(e)}"}
 
+        return GHLParser.parse_packet(packet_bytes, full_packet_hex)
+
+    @staticmethod
+    def parse_packet(packet_bytes, raw_hex=None):
+        # Decode an already framed packet (STX ... ETX) without the hex cleanup pass
+        if raw_hex is None:
+            raw_hex = packet_bytes.hex().upper()
+
         # Breakdown
         # Packet Structure: STX (1) + Payload (N) + LRC (8) + ETX (1)
         if len(packet_bytes) < 11:
@@ -79,7 +132,7 @@ class GHLParser:
 
         result = {
             "meta": {
-                "raw_hex": full_packet_hex,
+                "raw_hex": raw_hex,
                 "total_bytes": len(packet_bytes),
                 "payload_bytes": len(payload),
                 "valid_structure": True
@@ -188,6 +241,651 @@ class GHLParser:
         
         return data
 
+# --- LIVE FOLLOW (tail -f) ---
+# Simulator log lines look like "[11:50:02] TX > 0202000..." / "[11:50:03] RX < 02021..."
+# Only the hex after the marker is handed to the parser, so digits in the
+# timestamp can never be mistaken for an STX.
+FRAME_LINE_RE = re.compile(r"(?:\[(?P<ts>[0-9:]+)\]\s*)?(?P<dir>TX >|RX <)\s*(?P<hex>[0-9A-Fa-f]+)")
+FRAME_MARKER_RE = re.compile(r"(?:\[(?P<ts>[0-9:]+)\]\s*)?(?P<dir>TX >|RX <)")
+HEX_ONLY_RE = re.compile(r"[0-9A-Fa-f\s]+")
+
+class LogFollower:
+    def __init__(self, path, state_file=FOLLOW_STATE_FILE, poll=FOLLOW_POLL_SEC, from_start=False):
+        self.path = path
+        self.key = os.path.abspath(path)
+        self.state_file = state_file
+        self.poll = poll
+        self.from_start = from_start
+        self.fh = None
+        self.inode = None
+        self.offset = 0
+        self.partial = b""
+
+    # --- CHECKPOINT ---
+    def load_state(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, "r") as f: return json.load(f)
+        except: return {}
+
+    def save_state(self):
+        if not self.state_file:
+            return
+        states = self.load_state()
+        states[self.key] = {"inode": self.inode, "offset": self.offset}
+        # Write-then-rename so a crash never leaves a half written checkpoint
+        tmp = self.state_file + ".tmp"
+        with open(tmp, "w") as f: json.dump(states, f)
+        os.replace(tmp, self.state_file)
+
+    # --- FILE HANDLING ---
+    def open_file(self, resume):
+        self.fh = open(self.path, "rb")
+        st = os.fstat(self.fh.fileno())
+        self.inode = st.st_ino
+        self.offset = 0
+        self.partial = b""
+
+        if resume:
+            saved = self.load_state().get(self.key)
+            if saved and saved.get("inode") == st.st_ino and saved.get("offset", 0) <= st.st_size:
+                self.offset = saved["offset"]
+            elif not self.from_start and not saved:
+                # First run without a checkpoint: behave like tail -f
+                self.offset = st.st_size
+        self.fh.seek(self.offset)
+
+    def rotated(self):
+        # Returns "replaced" (new inode), "truncated" (copytruncate) or None
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None # Mid-rotation, keep reading the old handle
+        if st.st_ino != self.inode:
+            return "replaced"
+        if st.st_size < self.offset:
+            return "truncated"
+        return None
+
+    def read_lines(self):
+        chunk = self.fh.read(FOLLOW_READ_BYTES)
+        if not chunk:
+            return []
+        data = self.partial + chunk
+        lines = data.split(b"\n")
+        # Keep the unterminated tail for the next read; offset only covers full lines
+        self.partial = lines.pop()
+        self.offset += len(data) - len(self.partial)
+        return lines
+
+    @staticmethod
+    def decode_line(line):
+        m = FRAME_LINE_RE.search(line)
+        if not m:
+            return None
+        return LogFollower.label(GHLParser.parse_hex_string(m.group("hex")), m)
+
+    @staticmethod
+    def label(result, m):
+        result["direction"] = "TX" if m.group("dir").startswith("TX") else "RX"
+        if m.group("ts"):
+            result["log_time"] = m.group("ts")
+        return result
+
+    @staticmethod
+    def decode_paste(text):
+        # Pasted excerpts may space the bytes out or wrap a frame onto following
+        # lines: each marker takes the rest of its line plus any hex-only lines
+        # after it, up to the next marker or the first other line.
+        frames = []
+        open_frame = False
+        for line in text.splitlines():
+            m = FRAME_MARKER_RE.search(line)
+            if m:
+                frames.append([m, line[m.end():]])
+                open_frame = True
+            elif open_frame and HEX_ONLY_RE.fullmatch(line):
+                frames[-1][1] += line
+            else:
+                open_frame = False
+        return [LogFollower.label(GHLParser.parse_hex_string(hex_text), m) for m, hex_text in frames]
+
+    def emit_lines(self, lines, emit):
+        for raw in lines:
+            res = self.decode_line(raw.decode("ascii", errors="ignore"))
+            if res is not None:
+                emit(res)
+
+    def follow(self, emit):
+        # emit(result) is called once per decoded frame, in file order
+        self.open_file(resume=True)
+        try:
+            while True:
+                lines = self.read_lines()
+                if lines:
+                    self.emit_lines(lines, emit)
+                    self.save_state()
+                    continue
+
+                change = self.rotated()
+                if change == "replaced":
+                    # Drain anything written to the old file before the switch
+                    self.emit_lines(self.read_lines(), emit)
+                    self.fh.close()
+                    self.open_file(resume=False)
+                    self.save_state()
+                elif change == "truncated":
+                    self.fh.seek(0)
+                    self.offset = 0
+                    self.partial = b""
+                    self.save_state()
+                else:
+                    time.sleep(self.poll)
+        finally:
+            if self.fh: self.fh.close()
+
+def follow_stream(stream, emit):
+    # Journal / pipe input (e.g. `journalctl -f | ... --follow -`): no offsets to keep
+    for line in stream:
+        res = LogFollower.decode_line(line)
+        if res is not None:
+            emit(res)
+
+def emit_json_line(result):
+    sys.stdout.write(json.dumps(result) + "\n")
+    sys.stdout.flush()
+
+# --- BATCH SCAN (archived logs) ---
+# Frames are located with a byte-level regex straight over the mmap / decompressed
+# chunks, so neither whole lines nor the whole file are ever turned into str.
+FRAME_BYTES_RE = re.compile(rb"(?:\[(?P<ts>[0-9:]{8})\] )?(?P<dir>TX >|RX <) ?(?P<hex>[0-9A-Fa-f]+)")
+
+class LogScanner:
+    OPENERS = {".gz": gzip.open, ".xz": lzma.open, ".lzma": lzma.open, ".bz2": bz2.open}
+
+    RESPONSE_CMDS = {b"021", b"023", b"027", b"051"}
+
+    def __init__(self, chunk_size=BATCH_CHUNK_BYTES, raw=False):
+        self.chunk_size = chunk_size
+        # raw: emit(packet, log_time) for well framed responses only, no per-frame parsing
+        self.raw = raw
+        self.bytes_scanned = 0
+        self.frames = 0
+        self.elapsed = 0.0
+
+    @staticmethod
+    def decode_match(m):
+        hex_run = m.group("hex")
+        try:
+            packet = binascii.unhexlify(hex_run[:len(hex_run) & ~1])
+        except binascii.Error:
+            return None
+        if len(packet) >= 11 and packet[0] == 0x02 and packet[-1] == 0x03:
+            result = GHLParser.parse_packet(packet)
+        else:
+            # Odd framing (noise around the packet), let the tolerant path sort it out
+            result = GHLParser.parse_hex_string(hex_run.decode("ascii"))
+        result["direction"] = "TX" if m.group("dir") == b"TX >" else "RX"
+        if m.group("ts"):
+            result["log_time"] = m.group("ts").decode("ascii")
+        return result
+
+    def scan_buffer(self, buf, emit, start=0, end=None):
+        if self.raw:
+            return self.scan_buffer_raw(buf, emit, start, end)
+        for m in FRAME_BYTES_RE.finditer(buf, start, len(buf) if end is None else end):
+            res = self.decode_match(m)
+            if res is not None:
+                self.frames += 1
+                emit(res)
+
+    def scan_buffer_raw(self, buf, emit, start=0, end=None):
+        responses = self.RESPONSE_CMDS
+        for m in FRAME_BYTES_RE.finditer(buf, start, len(buf) if end is None else end):
+            if m.group("dir") != b"RX <":
+                continue
+            hex_run = m.group("hex")
+            try:
+                packet = binascii.unhexlify(hex_run[:len(hex_run) & ~1])
+            except binascii.Error:
+                continue
+            if len(packet) >= 14 and packet[0] == 0x02 and packet[-1] == 0x03 and packet[1:4] in responses:
+                self.frames += 1
+                emit(packet, m.group("ts"))
+
+    def scan_mmap(self, path, emit):
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                self.scan_buffer(mm, emit)
+                self.bytes_scanned += len(mm)
+
+    def scan_stream(self, fh, emit):
+        carry = b""
+        while True:
+            chunk = fh.read(self.chunk_size)
+            if not chunk:
+                break
+            self.bytes_scanned += len(chunk)
+            buf = carry + chunk if carry else chunk
+            # A frame never spans a newline, so everything up to the last one is safe to scan
+            cut = buf.rfind(b"\n") + 1
+            if cut == 0:
+                carry = buf
+                continue
+            self.scan_buffer(buf, emit, 0, cut)
+            carry = buf[cut:]
+        if carry:
+            self.scan_buffer(carry, emit)
+
+    def scan(self, path, emit):
+        t0 = time.perf_counter()
+        opener = self.OPENERS.get(os.path.splitext(path)[1].lower())
+        if opener:
+            with opener(path, "rb") as fh:
+                self.scan_stream(fh, emit)
+        else:
+            self.scan_mmap(path, emit)
+        self.elapsed += time.perf_counter() - t0
+
+    def stats(self):
+        mb = self.bytes_scanned / (1024 * 1024)
+        rate = mb / self.elapsed if self.elapsed else 0.0
+        return {"frames": self.frames, "mb_scanned": round(mb, 2),
+                "seconds": round(self.elapsed, 3), "mb_per_sec": round(rate, 2)}
+
+# --- COLUMNAR EXPORT ---
+# Decoded responses are dicts of strings; a month of them is far cheaper to keep
+# as typed arrays: cents as int64, card type as a byte, ids as dictionary codes.
+class DictColumn:
+    def __init__(self):
+        self.codes = array("I")
+        self.values = []
+        self.index = {}
+
+    def code_for(self, value):
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def append(self, value):
+        self.codes.append(self.code_for(value))
+
+    def clear_rows(self):
+        # Each chunk carries its own dictionary, so nothing grows across chunks
+        self.codes = array("I")
+        self.values = []
+        self.index = {}
+
+class ColumnarExport:
+    # name -> array typecode ("q" int64, "H" uint16, "B" uint8, "i" int32), "s" for
+    # plain strings or None for dictionary columns. Only low-cardinality ids are
+    # dictionary encoded; card numbers and auth codes are unique per transaction.
+    COLUMNS = [
+        ("timestamp_ms", "q"),
+        ("command", "H"),
+        ("error_code", None),
+        ("card_type", "B"),
+        ("card_number", "s"),
+        ("auth_code", "s"),
+        ("gross_cents", "q"),
+        ("net_cents", "q"),
+        ("stan", "i"),
+        ("invoice", "i"),
+        ("cashier_id", None),
+        ("card_label", None),
+        ("terminal_id", None),
+        ("merchant_id", None),
+        ("batch", "i"),
+    ]
+
+    # show_receipt's d_dict uses its own key names
+    RECEIPT_KEYS = {
+        "card": "card_number", "auth": "auth_code", "amount": "gross_amount",
+        "stan": "stan_trace", "invoice": "invoice_trace", "cashier": "cashier_id",
+        "card_name": "card_label", "batch": "batch_number",
+    }
+
+    def __init__(self, path, chunk_rows=EXPORT_CHUNK_ROWS):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.fmt = os.path.splitext(path)[1].lower().lstrip(".")
+        if self.fmt not in ("csv", "parquet", "arrow", "arrows"):
+            raise ValueError(f"Unsupported export format: {path}")
+        if self.fmt != "csv" and pa is None:
+            raise RuntimeError("pyarrow is required for Parquet/Arrow export (pip install pyarrow)")
+        self.base_date = date.today()
+        self.rows = 0
+        self.total_rows = 0
+        self.writer = None
+        self.fh = None
+        self.cols = {}
+        for name, code in self.COLUMNS:
+            self.cols[name] = self.new_column(code)
+
+    @staticmethod
+    def new_column(code):
+        if code is None:
+            return DictColumn()
+        return [] if code == "s" else array(code)
+
+    # --- CONVERSION HELPERS ---
+    @staticmethod
+    def to_cents(text):
+        whole, _, frac = (text or "0").partition(".")
+        try:
+            return int(whole or 0) * 100 + int((frac + "00")[:2])
+        except ValueError:
+            return 0
+
+    @staticmethod
+    def to_int(text, default=-1):
+        try:
+            return int(text)
+        except (TypeError, ValueError):
+            return default
+
+    def to_epoch_ms(self, log_time):
+        try:
+            t = dtime.fromisoformat(log_time)
+        except (TypeError, ValueError):
+            return 0
+        return int(datetime.combine(self.base_date, t).timestamp() * 1000)
+
+    # --- ACCUMULATE ---
+    @staticmethod
+    def to_text(value):
+        # parse_response marks fields cut off by a short frame as "N/A"
+        return "" if value is None or value == "N/A" else value
+
+    def add_response(self, decoded, log_time=None, payload_len=None):
+        c, text = self.cols, self.to_text
+        # parse_response reports a missing card type as 11 (E-WALLET); store 0 like --bulk
+        short = payload_len is not None and payload_len < 33
+        c["timestamp_ms"].append(self.to_epoch_ms(log_time))
+        c["command"].append(self.to_int(decoded.get("command"), 0))
+        c["error_code"].append(text(decoded.get("error_code")))
+        c["card_type"].append(0 if short else self.to_int(decoded.get("card_type_code"), 0) & 0xFF)
+        c["card_number"].append(text(decoded.get("card_number")))
+        c["auth_code"].append(text(decoded.get("auth_code")))
+        c["gross_cents"].append(self.to_cents(decoded.get("gross_amount")))
+        c["net_cents"].append(self.to_cents(decoded.get("net_amount")))
+        c["stan"].append(self.to_int(decoded.get("stan_trace")))
+        c["invoice"].append(self.to_int(decoded.get("invoice_trace")))
+        c["cashier_id"].append(text(decoded.get("cashier_id")))
+        c["card_label"].append(text(decoded.get("card_label")))
+        c["terminal_id"].append(text(decoded.get("terminal_id")))
+        c["merchant_id"].append(text(decoded.get("merchant_id")))
+        c["batch"].append(self.to_int(decoded.get("batch_number")))
+        self.rows += 1
+        if self.rows >= self.chunk_rows:
+            self.flush()
+
+    def add_columns(self, cols, n):
+        # Bulk path: cols from BulkDecoder.decode_block, typed numpy arrays, lists
+        # of str, or (values, codes) pairs for dictionary columns
+        for name, code in self.COLUMNS:
+            if code is None:
+                values, codes = cols[name]
+                dc = self.cols[name]
+                remap = np.array([dc.code_for(v) for v in values], dtype=np.uint32)
+                dc.codes.frombytes(remap[codes].tobytes())
+            elif code == "s":
+                self.cols[name].extend(cols[name])
+            else:
+                self.cols[name].frombytes(np.asarray(cols[name]).astype(np.dtype(code)).tobytes())
+        self.rows += n
+        if self.rows >= self.chunk_rows:
+            self.flush()
+
+    def add_receipt(self, d_dict, log_time=None):
+        decoded = {self.RECEIPT_KEYS.get(k, k): v for k, v in d_dict.items()}
+        # card_scheme is displayed as "08 (MYDEBIT)"
+        decoded["card_type_code"] = d_dict.get("card_scheme", "")[:2]
+        decoded.setdefault("command", "021")
+        decoded.setdefault("error_code", "00")
+        self.add_response(decoded, log_time)
+
+    def add_result(self, result):
+        # Hook for LogScanner/LogFollower output; requests and bad frames are skipped
+        if result.get("type", "").startswith("RESPONSE"):
+            self.add_response(result["decoded"], result.get("log_time"), result["meta"].get("payload_bytes"))
+
+    # --- WRITE ---
+    def chunk_table(self):
+        arrays, names = [], []
+        for name, code in self.COLUMNS:
+            col = self.cols[name]
+            if code is None:
+                arr = pa.DictionaryArray.from_arrays(pa.array(col.codes, type=pa.uint32()), pa.array(col.values, type=pa.string()))
+            elif code == "s":
+                arr = pa.array(col, type=pa.string())
+            else:
+                arr = pa.array(col, type={"q": pa.int64(), "H": pa.uint16(), "B": pa.uint8(), "i": pa.int32()}[code])
+            arrays.append(arr)
+            names.append(name)
+        return pa.Table.from_arrays(arrays, names=names)
+
+    def write_csv_chunk(self):
+        if self.writer is None:
+            self.fh = open(self.path, "w", newline="")
+            self.writer = csv.writer(self.fh)
+            self.writer.writerow([name for name, _ in self.COLUMNS])
+        cols = []
+        for name, code in self.COLUMNS:
+            col = self.cols[name]
+            cols.append([col.values[i] for i in col.codes] if code is None else col)
+        self.writer.writerows(zip(*cols))
+
+    def write_arrow_chunk(self):
+        table = self.chunk_table()
+        if self.writer is None:
+            if self.fmt == "parquet":
+                self.writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                # Stream format: each batch replaces the previous dictionaries
+                self.writer = pa.ipc.new_stream(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def flush(self):
+        if not self.rows:
+            return
+        if self.fmt == "csv":
+            self.write_csv_chunk()
+        else:
+            self.write_arrow_chunk()
+        self.total_rows += self.rows
+        self.rows = 0
+        for name, code in self.COLUMNS:
+            if code is None:
+                self.cols[name].clear_rows()
+            else:
+                self.cols[name] = self.new_column(code)
+
+    def close(self):
+        self.flush()
+        if self.writer is not None and self.fmt != "csv":
+            self.writer.close()
+        if self.fh:
+            self.fh.close()
+        return self.total_rows
+
+# --- BULK DECODE (NumPy) ---
+# Responses are fixed-width ASCII, so a block of payloads packed into one buffer
+# is a structured array; numbers are converted a whole column at a time.
+class BulkDecoder:
+    # (name, offset, width), the same layout parse_response reads
+    FIELDS = [
+        ("command", 0, 3), ("error_code", 3, 2), ("card_number", 5, 22), ("expiry", 27, 4),
+        ("card_type", 31, 2), ("auth_code", 33, 8), ("gross", 41, 12), ("net", 53, 12),
+        ("stan", 65, 6), ("invoice", 71, 6), ("cashier_id", 77, 4), ("card_label", 81, 15),
+        ("terminal_id", 96, 8), ("merchant_id", 104, 15), ("batch", 119, 6),
+    ]
+    DICT_FIELDS = ("error_code", "cashier_id", "card_label", "terminal_id", "merchant_id")
+    STR_FIELDS = ("card_number", "auth_code") # Unique per transaction, not worth a dictionary
+    FIELD_ENDS = sorted(offset + width for _, offset, width in FIELDS)
+
+    def __init__(self, sink, block_frames=BULK_BLOCK_FRAMES):
+        if np is None:
+            raise RuntimeError("numpy is required for --bulk (pip install numpy)")
+        # sink(cols, n) receives every decoded block
+        self.sink = sink
+        self.block_frames = block_frames
+        self.base_date = date.today()
+        self.dtype = np.dtype({
+            "names": [f[0] for f in self.FIELDS],
+            "formats": [f"S{f[2]}" for f in self.FIELDS],
+            "offsets": [f[1] for f in self.FIELDS],
+            "itemsize": RESP_PAYLOAD_LEN,
+        })
+        self.payloads = []
+        self.times = []
+        self.total = 0
+
+    def add(self, packet, log_time=None):
+        payload = packet[1:-9]
+        if len(payload) != RESP_PAYLOAD_LEN:
+            # Blank a field the frame cuts off part way, as parse_response does
+            keep = max([end for end in self.FIELD_ENDS if end <= len(payload)], default=0)
+            payload = payload[:keep].ljust(RESP_PAYLOAD_LEN)
+        self.payloads.append(payload)
+        self.times.append(log_time or b"        ")
+        if len(self.payloads) >= self.block_frames:
+            self.flush()
+
+    @staticmethod
+    def digits(block, offset, width):
+        # ASCII digit columns -> int64, blanks count as 0, anything else -> -1
+        d = block[:, offset:offset + width].astype(np.int64) - 48
+        blank = d == -16
+        valid = ((d >= 0) & (d <= 9) | blank).all(axis=1) & ~blank.all(axis=1)
+        d[blank] = 0
+        value = d @ (10 ** np.arange(width - 1, -1, -1, dtype=np.int64))
+        value[~valid] = -1
+        return value
+
+    def epoch_ms(self, times):
+        # "HH:MM:SS" column -> epoch ms on base_date, 0 when the line had no timestamp
+        t = np.frombuffer(b"".join(times), dtype=np.uint8).reshape(-1, 8).astype(np.int64) - 48
+        secs = (t[:, 0] * 10 + t[:, 1]) * 3600 + (t[:, 3] * 10 + t[:, 4]) * 60 + t[:, 6] * 10 + t[:, 7]
+        midnight = int(datetime.combine(self.base_date, dtime()).timestamp() * 1000)
+        return np.where(t[:, 2] == 10, midnight + secs * 1000, 0) # ':' is 58 - 48 = 10
+
+    def decode_block(self, payloads, times):
+        n = len(payloads)
+        buf = b"".join(payloads)
+        rec = np.frombuffer(buf, dtype=self.dtype)
+        block = np.frombuffer(buf, dtype=np.uint8).reshape(n, RESP_PAYLOAD_LEN)
+
+        cols = {
+            "timestamp_ms": self.epoch_ms(times),
+            "command": self.digits(block, 0, 3).clip(0),
+            "card_type": self.digits(block, 31, 2).clip(0, 255),
+            "gross_cents": self.digits(block, 41, 12).clip(0),
+            "net_cents": self.digits(block, 53, 12).clip(0),
+            "stan": self.digits(block, 65, 6),
+            "invoice": self.digits(block, 71, 6),
+            "batch": self.digits(block, 119, 6),
+        }
+        for name in self.DICT_FIELDS:
+            uniq, codes = np.unique(rec[name], return_inverse=True)
+            cols[name] = ([u.decode("ascii", errors="ignore").strip() for u in uniq], codes.ravel())
+        for name in self.STR_FIELDS:
+            cols[name] = [v.decode("ascii", errors="ignore").strip() for v in rec[name].tolist()]
+        return cols, n
+
+    def flush(self):
+        if not self.payloads:
+            return
+        cols, n = self.decode_block(self.payloads, self.times)
+        self.payloads, self.times = [], []
+        self.total += n
+        self.sink(cols, n)
+
+class BulkSummary:
+    # Default --bulk sink: per card scheme / terminal totals without keeping rows
+    def __init__(self):
+        self.by_type = {}
+        self.by_terminal = {}
+
+    def add(self, cols, n):
+        types = cols["card_type"]
+        gross = cols["gross_cents"]
+        for code in np.unique(types):
+            mask = types == code
+            row = self.by_type.setdefault(GHLParser.CARD_TYPES.get(f"{code:02d}", f"{code:02d}"), [0, 0])
+            row[0] += int(mask.sum()); row[1] += int(gross[mask].sum())
+        names, codes = cols["terminal_id"]
+        counts = np.bincount(codes, minlength=len(names))
+        sums = np.bincount(codes, weights=gross, minlength=len(names))
+        for name, c, g in zip(names, counts, sums):
+            row = self.by_terminal.setdefault(name or "N/A", [0, 0])
+            row[0] += int(c); row[1] += int(g)
+
+    def report(self):
+        fmt = lambda d: {k: {"count": c, "gross_cents": g} for k, (c, g) in sorted(d.items())}
+        return {"by_card_type": fmt(self.by_type), "by_terminal": fmt(self.by_terminal)}
+
+# --- OUTPUT RENDERER ---
+NUM_RE = re.compile(r"\d+\.?\d*|\.\d+")
+
+class JsonRenderer:
+    # Builds the whole output text and its tag ranges in one pass, so the Text
+    # widget gets one insert plus one tag_add per tag instead of two inserts per field.
+    TAGS = ("key", "str", "num", "err", "sep")
+
+    def __init__(self):
+        self.lines = []
+        self.spans = {tag: [] for tag in self.TAGS}
+
+    def add_dict(self, data, indent=0):
+        space = " " * indent
+        for k, v in data.items():
+            line_no = len(self.lines) + 1
+            key_txt = f"{space}{k}: "
+            self.spans["key"].append((line_no, 0, len(key_txt)))
+
+            if isinstance(v, dict):
+                self.lines.append(key_txt)
+                self.add_dict(v, indent + 4)
+                continue
+
+            # Newlines would break the line.col bookkeeping
+            val_str = str(v).replace("\n", "\\n")
+            tag = "str"
+            if isinstance(v, (int, float)) or (isinstance(v, str) and NUM_RE.fullmatch(v)):
+                tag = "num"
+            if "error" in k:
+                tag = "err"
+            self.spans[tag].append((line_no, len(key_txt), len(key_txt) + len(val_str)))
+            self.lines.append(key_txt + val_str)
+
+    def add_separator(self, text):
+        self.spans["sep"].append((len(self.lines) + 1, 0, len(text)))
+        self.lines.append(text)
+
+    def render(self, widget):
+        # Append after whatever is already in the widget, starting on a fresh line
+        line, col = map(int, widget.index("end-1c").split("."))
+        if col:
+            widget.insert(tk.END, "\n")
+            line += 1
+        base = line - 1
+
+        widget.insert(tk.END, "\n".join(self.lines) + "\n")
+        for tag, spans in self.spans.items():
+            idx = []
+            for line_no, a, b in spans:
+                idx.append(f"{base + line_no}.{a}")
+                idx.append(f"{base + line_no}.{b}")
+            step = RENDER_TAG_BATCH * 2
+            for i in range(0, len(idx), step):
+                widget.tag_add(tag, *idx[i:i + step])
+
 class TranslatorApp:
     def __init__(self, root):
         self.root = root
@@ -195,6 +893,9 @@ class TranslatorApp:
         self.root.geometry("700x800")
         self.root.configure(bg=COL_BG_MAIN)
         
+        self.results = []
+        self.page = 0
+
         self.setup_styles()
         self.build_ui()
 
@@ -234,7 +935,16 @@ class TranslatorApp:
         # Output Area
         output_frame = ttk.Frame(self.root, style="Main.TFrame", padding=20)
         output_frame.pack(fill="both", expand=True)
-        ttk.Label(output_frame, text="DECODED JSON OUTPUT:", style="Sub.TLabel").pack(anchor="w")
+        out_hdr = ttk.Frame(output_frame, style="Main.TFrame")
+        out_hdr.pack(fill="x")
+        ttk.Label(out_hdr, text="DECODED JSON OUTPUT:", style="Sub.TLabel").pack(side="left")
+
+        # Pager, only shown when the result does not fit one page
+        self.pager = ttk.Frame(out_hdr, style="Main.TFrame")
+        ttk.Button(self.pager, text="NEXT >", width=8, command=lambda: self.show_page(self.page + 1)).pack(side="right")
+        self.lbl_page = ttk.Label(self.pager, text="", style="Sub.TLabel")
+        self.lbl_page.pack(side="right", padx=8)
+        ttk.Button(self.pager, text="< PREV", width=8, command=lambda: self.show_page(self.page - 1)).pack(side="right")
         
         self.txt_output = scrolledtext.ScrolledText(output_frame, font=FONT_INPUT, 
                                                     bg=COL_CARD, fg=COL_TEXT)
@@ -245,40 +955,117 @@ class TranslatorApp:
         self.txt_output.tag_config("str", foreground=COL_JSON_STR)
         self.txt_output.tag_config("num", foreground=COL_JSON_NUM)
         self.txt_output.tag_config("err", foreground="red", font=("Consolas", 11, "bold"))
+        self.txt_output.tag_config("sep", foreground=COL_HEADER_TXT, font=("Consolas", 11, "bold"))
 
     def do_translate(self):
         raw_text = self.txt_input.get("1.0", tk.END).strip()
         if not raw_text:
             return
 
-        result = GHLParser.parse_hex_string(raw_text)
-        
+        # Pasted log excerpts: decode every TX/RX frame. Anything else: single frame as before.
+        if len(FRAME_MARKER_RE.findall(raw_text)) > 1:
+            results = LogFollower.decode_paste(raw_text)
+        else:
+            results = [GHLParser.parse_hex_string(raw_text)]
+
+        self.results = results
+        self.show_page(0)
+
+    def show_page(self, page):
+        pages = max(1, -(-len(self.results) // RENDER_PAGE_FRAMES))
+        if not 0 <= page < pages:
+            return
+        self.page = page
+
+        first = page * RENDER_PAGE_FRAMES
+        chunk = self.results[first:first + RENDER_PAGE_FRAMES]
+        renderer = JsonRenderer()
+        if len(self.results) == 1:
+            renderer.add_dict(chunk[0])
+        else:
+            for n, res in enumerate(chunk, first + 1):
+                renderer.add_separator(f"# FRAME {n} / {len(self.results)}")
+                renderer.add_dict(res)
+
         self.txt_output.delete("1.0", tk.END)
-        self.pretty_print_json(result)
+        renderer.render(self.txt_output)
+        self.txt_output.yview_moveto(0)
+
+        if pages > 1:
+            self.lbl_page.config(text=f"PAGE {page + 1} / {pages}")
+            self.pager.pack(side="right")
+        else:
+            self.pager.pack_forget()
 
     def pretty_print_json(self, data, indent=0):
-        # Custom JSON printer to apply tkinter tags
-        space = " " * indent
-        
-        for k, v in data.items():
-            # Print Key
-            self.txt_output.insert(tk.END, f"{space}{k}: ", "key")
-            
-            if isinstance(v, dict):
-                self.txt_output.insert(tk.END, "\n")
-                self.pretty_print_json(v, indent + 4)
+        # Single dict straight into the output (appends)
+        renderer = JsonRenderer()
+        renderer.add_dict(data, indent)
+        renderer.render(self.txt_output)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="GHL Protocol Translator (GUI when run without options)")
+    ap.add_argument("--follow", metavar="LOG", help="Follow a growing simulator log ('-' for stdin) and print decoded frames as JSON lines")
+    ap.add_argument("--state", default=FOLLOW_STATE_FILE, help="Offset checkpoint file for --follow")
+    ap.add_argument("--from-start", action="store_true", help="With no checkpoint, decode the existing log instead of starting at its end")
+    ap.add_argument("--batch", nargs="+", metavar="LOG", help="Decode archived logs (.gz/.xz/.bz2 streamed, plain files mmapped)")
+    ap.add_argument("--stats-only", action="store_true", help="With --batch, skip the JSON output and only report throughput")
+    ap.add_argument("--export", metavar="OUT", help="With --batch, write decoded responses as typed columns (.csv, .parquet, .arrow)")
+    ap.add_argument("--log-date", help="Date (YYYY-MM-DD) for the [HH:MM:SS] log timestamps; defaults to each file's modified date")
+    ap.add_argument("--bulk", action="store_true", help="With --batch, decode responses column-wise with NumPy (totals, or --export)")
+    args = ap.parse_args(argv)
+
+    if args.batch and args.bulk:
+        scanner = LogScanner(raw=True)
+        exporter = ColumnarExport(args.export) if args.export else None
+        summary = None if exporter else BulkSummary()
+        bulk = BulkDecoder(exporter.add_columns if exporter else summary.add)
+        t0 = time.perf_counter()
+        for path in args.batch:
+            bulk.base_date = date.fromisoformat(args.log_date) if args.log_date \
+                else date.fromtimestamp(os.path.getmtime(path))
+            scanner.scan(path, bulk.add)
+            bulk.flush()
+        scanner.elapsed = time.perf_counter() - t0 # Include the last block's decode
+        stats = scanner.stats()
+        if exporter:
+            stats["rows_exported"] = exporter.close()
+        else:
+            print(json.dumps(summary.report(), indent=2))
+        sys.stderr.write(json.dumps(stats) + "\n")
+        return
+
+    if args.batch:
+        scanner = LogScanner()
+        exporter = ColumnarExport(args.export) if args.export else None
+        if exporter:
+            emit = exporter.add_result
+        else:
+            emit = (lambda res: None) if args.stats_only else emit_json_line
+        for path in args.batch:
+            if exporter:
+                exporter.base_date = date.fromisoformat(args.log_date) if args.log_date \
+                    else date.fromtimestamp(os.path.getmtime(path))
+            scanner.scan(path, emit)
+        stats = scanner.stats()
+        if exporter:
+            stats["rows_exported"] = exporter.close()
+        sys.stderr.write(json.dumps(stats) + "\n")
+        return
+
+    if args.follow:
+        try:
+            if args.follow == "-":
+                follow_stream(sys.stdin, emit_json_line)
             else:
-                # Print Value
-                tag = "str"
-                val_str = str(v)
-                if isinstance(v, (int, float)) or (isinstance(v, str) and v.replace('.', '', 1).isdigit()):
-                    tag = "num"
-                if "error" in k:
-                    tag = "err"
-                
-                self.txt_output.insert(tk.END, f"{val_str}\n", tag)
+                LogFollower(args.follow, state_file=args.state, from_start=args.from_start).follow(emit_json_line)
+        except KeyboardInterrupt:
+            pass
+        return
 
-if __name__ == "__main__":
     root = tk.Tk()
     app = TranslatorApp(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -5,8 +5,11 @@ import serial.tools.list_ports
 import threading
 import time
 from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
 import json
 import os
+import errno
+from collections import OrderedDict
 
 # --- THEME CONSTANTS ---
 COL_BG_MAIN = "#F4F6F9"        
@@ -34,6 +37,17 @@ FONT_RECEIPT = ("Courier New", 10)
 STX = b'\x02'
 ETX = b'\x03'
 CONFIG_FILE = "simulator_config.json"
+RESP_TIMEOUT = 60 # Seconds to wait for the terminal (card interaction included)
+TXN_CACHE_TTL = 300 # Seconds a request is remembered for retry protection
+TXN_CACHE_SIZE = 256
+IDEMPOTENT_CMDS = ("020", "022", "026") # Settlement (050) is safe to repeat
+
+# Health probing
+PROBE_FAST = 5       # Seconds between probes while a terminal is failing
+PROBE_SLOW = 120     # Longest gap between probes while healthy
+PROBE_TIMEOUT = 2    # Seconds to wait for a probe answer
+PORT_LOCK_WAIT = 1   # Seconds send_recv waits for the port before reporting busy
+HEALTH_COLORS = {"up": "#00C853", "degraded": "#FFB300", "down": "#E53935", "in use": "#1E88E5", "unknown": "#B0BEC5"}
 
 # --- HELPER: TOAST NOTIFICATION ---
 class ToastNotification(tk.Toplevel):
@@ -156,6 +170,47 @@ NET AMT:      RM {data_dict.get('net_amount', '0.00')}
         self.clipboard_append(self.receipt_content)
         messagebox.showinfo("Copied", "Receipt text has been copied to clipboard!")
 
+# --- HELPER: FLEET STATUS POPUP ---
+class FleetStatusPopup(tk.Toplevel):
+    COLUMNS = [("port", "PORT", 110), ("state", "STATUS", 80), ("latency", "LATENCY", 80),
+               ("seen", "LAST SEEN", 80), ("next", "NEXT PROBE", 80), ("detail", "DETAIL", 220)]
+
+    def __init__(self, parent, prober, ports_fn):
+        super().__init__(parent)
+        self.title("Terminal Fleet Status")
+        self.geometry("680x300")
+        self.configure(bg=COL_BG_MAIN)
+        self.prober = prober
+        self.ports_fn = ports_fn
+
+        self.tree = ttk.Treeview(self, columns=[c[0] for c in self.COLUMNS], show="headings", height=8)
+        for key, title, width in self.COLUMNS:
+            self.tree.heading(key, text=title)
+            self.tree.column(key, width=width, anchor="w")
+        for state, color in HEALTH_COLORS.items():
+            self.tree.tag_configure(state, foreground=color)
+        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+
+        btns = tk.Frame(self, bg=COL_BG_MAIN)
+        btns.pack(pady=(0, 10))
+        ttk.Button(btns, text="PROBE NOW", command=self.prober.probe_now).pack(side="left", padx=5)
+        ttk.Button(btns, text="CLOSE", command=self.destroy).pack(side="left", padx=5)
+        self.refresh()
+
+    def refresh(self):
+        if not self.winfo_exists():
+            return
+        now = time.time()
+        self.tree.delete(*self.tree.get_children())
+        for port in self.ports_fn():
+            st = self.prober.get(port)
+            latency = f"{st['latency_ms']:.0f} ms" if st.get("latency_ms") is not None else "-"
+            seen = datetime.fromtimestamp(st["last_seen"]).strftime("%H:%M:%S") if st.get("last_seen") else "never"
+            nxt = f"{max(0, st.get('next_at', now) - now):.0f} s" if st.get("next_at") else "-"
+            self.tree.insert("", "end", values=(port, st["state"].upper(), latency, seen, nxt, st.get("detail", "")),
+                             tags=(st["state"],))
+        self.after(1000, self.refresh)
+
 # --- CUSTOM WIDGET: ATM INPUT ---
 class CurrencyEntry(tk.Entry):
     def __init__(self, master=None, **kwargs):
@@ -186,14 +241,17 @@ class CurrencyEntry(tk.Entry):
         return self.raw_value / 100.0
 
     def set_amount(self, float_val):
-        self.raw_value = int(float_val * 100)
+        self.raw_value = int(round(float_val * 100))
         self.update_display()
 
 # --- BACKEND LOGIC ---
 class GHLProtocol:
     def __init__(self):
         self.ser = None
+        self.port = None
         self.stop_flag = False
+        self.in_flight = False # True while send_recv waits for the terminal
+        self.port_lock = threading.Lock() # Held by send_recv and the health prober while they use the port
 
     def connect(self, port):
         # Safety Close first to prevent PermissionError
@@ -201,10 +259,13 @@ class GHLProtocol:
         time.sleep(0.1) # Brief pause to let Windows release the handle
         
         try:
+            # exclusive: on POSIX other simulators, schedulers and the health
+            # prober get "in use" instead of sharing (and flushing) the port
             self.ser = serial.Serial(
                 port=port, baudrate=9600, bytesize=8,
-                parity='N', stopbits=1, timeout=1
+                parity='N', stopbits=1, timeout=1, exclusive=True
             )
+            self.port = port
             return True, f"Connected to {port}"
         except Exception as e:
             return False, str(e)
@@ -216,6 +277,9 @@ class GHLProtocol:
         except:
             pass # Ignore errors during disconnect
 
+    def is_connected(self):
+        return bool(self.ser and self.ser.is_open)
+
     def cancel_wait(self):
         self.stop_flag = True
 
@@ -229,39 +293,237 @@ class GHLProtocol:
             for j in range(8): chk[j] ^= chunk[j]
         return bytes(chk)
 
+    def frame_complete(self, buff):
+        # The check digit itself may contain 0x03, so an ETX only ends the
+        # frame once the XOR over the payload matches
+        if len(buff) < 11 or buff[0:1] != STX:
+            return True
+        return self.calculate_chk(buff[1:-9]) == bytes(buff[-9:-1])
+
+    @staticmethod
+    def to_cents(amt):
+        # Round, never truncate: the float 1.13 is 1.12999... and int() would send 112
+        return int((Decimal(str(amt)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
     def build_packet(self, cmd, amt, inv, cshr):
         # Spec 4.1 [cite: 240]
-        payload = f"{cmd}{int(amt*100):012d}{int(inv):06d}{str(cshr):>4}".encode('ascii')
+        payload = f"{cmd}{self.to_cents(amt):012d}{int(inv):06d}{str(cshr):>4}".encode('ascii')
         return STX + payload + self.calculate_chk(payload) + ETX
 
-    def send_recv(self, packet, cb):
-        if not self.ser or not self.ser.is_open:
+    def send_recv(self, packet, cb, timeout=RESP_TIMEOUT):
+        if not self.is_connected():
             cb("Err: Disconnected", None)
             return
+        if not self.port_lock.acquire(timeout=PORT_LOCK_WAIT):
+            cb("Err: Terminal busy", None)
+            return
         self.stop_flag = False
+        self.in_flight = True
         
         def t():
             try:
                 cb(f"TX > {packet.hex().upper()}", None)
+                self.ser.reset_input_buffer() # Drop late answers to an earlier request
                 self.ser.write(packet)
                 buff = bytearray()
                 start = time.time()
                 while True:
                     if self.stop_flag: 
                         cb("User Cancelled (Software Side)", None); return
-                    if time.time() - start > 60: 
+                    if time.time() - start > timeout: 
                         cb("Err: Timeout", None); return
                     
                     b = self.ser.read(1)
                     if b:
                         buff.extend(b)
-                        if b == ETX:
+                        if b == ETX and self.frame_complete(buff):
                             cb(f"RX < {buff.hex().upper()}", bytes(buff))
                             return
+                    elif buff[-1:] == ETX:
+                        # Line went quiet right after an ETX whose check digit did not verify
+                        cb(f"RX < {buff.hex().upper()}", bytes(buff))
+                        return
             except Exception as e:
                 cb(f"Err: {e}", None)
+            finally:
+                self.in_flight = False
+                self.port_lock.release()
         threading.Thread(target=t, daemon=True).start()
 
+    def transact(self, packet, timeout=RESP_TIMEOUT):
+        # Blocking send_recv for headless callers: returns (raw_response or None, log lines)
+        done = threading.Event()
+        logs = []
+        resp = []
+        def cb(msg, data):
+            logs.append(msg)
+            if data is not None or not msg.startswith("TX"):
+                resp.append(data)
+                done.set()
+        self.send_recv(packet, cb, timeout)
+        done.wait(timeout + 5)
+        return (resp[0] if resp else None), logs
+
+# --- HEALTH PROBER ---
+class HealthProber:
+    # Cheap background checks per port, without sending anything to the
+    # terminal (every GHL command is a financial transaction):
+    #   adapter still present and openable
+    #   DSR/CD/CTS: on cables that carry them they drop when the terminal is
+    #   powered off or undocked. A port whose lines were never seen high is
+    #   treated as not wired and only reported as open.
+    # Probes back off while healthy, tighten after a failure and take the
+    # protocol's port lock, so they never overlap a transaction.
+    def __init__(self, proto, ports_fn):
+        self.proto = proto        # The app's own connection, probed in place
+        self.ports_fn = ports_fn  # -> ports to watch
+        self.status = {}
+        self.lock = threading.Lock()
+        self.running = False
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self.loop, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.running = False
+
+    def get(self, port):
+        with self.lock:
+            return dict(self.status.get(port) or {"state": "unknown"})
+
+    def probe_now(self, port=None):
+        with self.lock:
+            for p, st in self.status.items():
+                if port is None or p == port:
+                    st["next_at"] = 0
+
+    def loop(self):
+        while self.running:
+            now = time.time()
+            for port in list(self.ports_fn()):
+                with self.lock:
+                    st = self.status.setdefault(port, {"state": "unknown", "fails": 0, "interval": PROBE_FAST,
+                                                       "next_at": 0, "latency_ms": None, "last_seen": None, "detail": ""})
+                    due = now >= st["next_at"]
+                if due:
+                    self.probe(port)
+            time.sleep(0.5)
+
+    def probe(self, port):
+        own = self.proto.is_connected() and self.proto.port == port
+        if own and not self.proto.port_lock.acquire(blocking=False):
+            # Never compete with a live transaction; look again shortly
+            with self.lock:
+                self.status[port]["next_at"] = time.time() + PROBE_FAST
+            return
+        t0 = time.perf_counter()
+        try:
+            ok, detail = self.probe_own(port) if own else self.probe_port(port)
+        except Exception as e:
+            ok, detail = False, str(e)
+        finally:
+            if own:
+                self.proto.port_lock.release()
+        self.record(port, ok, (time.perf_counter() - t0) * 1000, detail)
+
+    def check_lines(self, port, ser):
+        try:
+            lines = {"DSR": ser.dsr, "CD": ser.cd, "CTS": ser.cts} # Raises once a USB adapter has been pulled
+        except OSError as e:
+            if e.errno not in (errno.ENOTTY, errno.EINVAL): # No modem lines (pty, some drivers)
+                raise
+            return True, "Port open (no modem lines)"
+        high = [name for name, on in lines.items() if on]
+        with self.lock:
+            st = self.status[port]
+            st["wired"] = st.get("wired") or bool(high)
+            wired = st["wired"]
+        if high:
+            return True, "/".join(high) + " up"
+        if wired:
+            return False, "DSR/CD/CTS dropped: terminal off or undocked"
+        return True, "Port open (cable carries no DSR/CD/CTS)"
+
+    def probe_own(self, port):
+        ser = getattr(self.proto, "ser", None)
+        if ser is None:
+            return True, "Port open" # Serial worker: the port lives in another process
+        return self.check_lines(port, ser)
+
+    def probe_port(self, port):
+        listed = {p.device for p in serial.tools.list_ports.comports()}
+        if port not in listed and not os.path.exists(port):
+            return False, "Port not present"
+        try:
+            ser = serial.Serial(port=port, baudrate=9600, timeout=PROBE_TIMEOUT, exclusive=True)
+        except (serial.SerialException, OSError, ValueError) as e:
+            if "denied" in str(e).lower() or "busy" in str(e).lower() or "lock" in str(e).lower():
+                return None, "Port held by another application"
+            raise
+        try:
+            return self.check_lines(port, ser)
+        finally:
+            ser.close()
+
+    def record(self, port, ok, latency_ms, detail):
+        now = time.time()
+        with self.lock:
+            st = self.status[port]
+            st["detail"] = detail
+            st["last_probe"] = now
+            if ok is None:
+                # Someone else owns the port: say so, keep the current cadence
+                st["state"] = "in use"
+            elif ok:
+                st["state"] = "up"
+                st["fails"] = 0
+                st["latency_ms"] = round(latency_ms, 1)
+                st["last_seen"] = now
+                st["interval"] = min(max(st["interval"] * 2, PROBE_FAST), PROBE_SLOW)
+            else:
+                st["fails"] += 1
+                st["state"] = "degraded" if st["fails"] == 1 else "down"
+                st["interval"] = PROBE_FAST
+            st["next_at"] = now + st["interval"]
+
+# --- RETRY PROTECTION ---
+class TxnCache:
+    # Recent requests keyed by (lane, cmd, amount, cashier, invoice) with their
+    # outcome, so a retry after a timeout does not start a second card charge.
+    # States: "pending" (in flight), "approved", "declined", "unknown" (no answer)
+    def __init__(self, ttl=TXN_CACHE_TTL, max_size=TXN_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+    def purge(self):
+        now = time.time()
+        while self.entries:
+            key, entry = next(iter(self.entries.items()))
+            if now - entry["ts"] <= self.ttl and len(self.entries) <= self.max_size:
+                break
+            self.entries.popitem(last=False)
+
+    def get(self, key):
+        self.purge()
+        return self.entries.get(key)
+
+    def begin(self, key):
+        self.entries[key] = {"state": "pending", "ts": time.time(), "data": None}
+        self.entries.move_to_end(key)
+        self.purge()
+
+    def finish(self, key, state, data=None):
+        entry = self.entries.get(key)
+        if entry is not None:
+            entry.update(state=state, data=data, ts=time.time())
+            self.entries.move_to_end(key)
+
+    def forget(self, key):
+        self.entries.pop(key, None)
+
 # --- GUI ---
 class POSApp:
     # --- Card Type Mapping from Spec Appendix B  ---
@@ -276,19 +538,27 @@ class POSApp:
         "11": "E-WALLET"
     }
 
-    def __init__(self, root):
+    def __init__(self, root, proto=None):
         self.root = root
         self.root.title("GHL Terminal Simulator // KESH v1019")
         self.root.geometry("950x800")
         self.root.configure(bg=COL_BG_MAIN)
-        self.proto = GHLProtocol()
+        # proto may be a GHL_Serial_Worker.WorkerProtocol to keep serial I/O out of this process
+        self.proto = proto or GHLProtocol()
+        self.txn_cache = TxnCache()
+        self.fleet_ports = []  # Extra ports to health-check (simulator_config.json "fleet_ports")
+        self.watch_ports = []
         
         self.setup_styles()
         self.build_layout()
         self.load_settings() 
 
+        self.prober = HealthProber(self.proto, lambda: self.watch_ports).start()
+        self.refresh_health()
+
         import atexit
-        atexit.register(self.proto.disconnect)
+        # A shared serial worker keeps its port open for other clients
+        atexit.register(getattr(self.proto, "detach", self.proto.disconnect))
 
     def setup_styles(self):
         s = ttk.Style()
@@ -401,6 +671,7 @@ class POSApp:
         tools.pack(side="right")
         # Added CODES button
         ttk.Button(tools, text="CODES", style="Small.TButton", width=8, command=self.show_legend).pack(side="left", padx=2)
+        ttk.Button(tools, text="FLEET", style="Small.TButton", width=8, command=self.show_fleet).pack(side="left", padx=2)
         ttk.Button(tools, text="COPY", style="Small.TButton", width=8, command=self.copy_log).pack(side="left", padx=2)
         ttk.Button(tools, text="SAVE", style="Small.TButton", width=8, command=self.save_log).pack(side="left", padx=2)
         ttk.Button(tools, text="CLEAR", style="Small.TButton", width=8, command=self.clr_log).pack(side="left", padx=2)
@@ -418,7 +689,8 @@ class POSApp:
             "port": self.port_var.get(),
             "invoice": self.ent_inv.get(),
             "cashier": self.ent_csh.get(),
-            "auto_inc": self.var_autoincrement.get()
+            "auto_inc": self.var_autoincrement.get(),
+            "fleet_ports": self.fleet_ports
         }
         try:
             with open(CONFIG_FILE, "w") as f: json.dump(data, f)
@@ -437,6 +709,7 @@ class POSApp:
                     self.ent_csh.insert(0, data["cashier"])
                 if "auto_inc" in data:
                     self.var_autoincrement.set(data["auto_inc"])
+                self.fleet_ports = data.get("fleet_ports") or []
             except: pass
 
     # --- ACTIONS ---
@@ -446,6 +719,82 @@ class POSApp:
     def show_legend(self):
         CardLegendPopup(self.root)
 
+    def show_fleet(self):
+        FleetStatusPopup(self.root, self.prober, lambda: self.watch_ports)
+
+    def refresh_health(self):
+        # Runs on the Tk thread: the prober thread only ever reads watch_ports
+        port = self.port_var.get()
+        self.watch_ports = [port] + [p for p in self.fleet_ports if p != port]
+        if self.proto.is_connected():
+            state = self.prober.get(port)["state"]
+            self.cv_status.itemconfig(self.status_dot, fill=HEALTH_COLORS.get(state, HEALTH_COLORS["up"]))
+        self.root.after(1000, self.refresh_health)
+
+    @classmethod
+    def receipt_fields(cls, payload):
+        # Spec 4.2 field mapping for the receipt; payload = response without STX/CheckDigit/ETX
+        p_len = len(payload)
+
+        # Helper to safely extract fields even if packet is short
+        def get_val(start, length, is_numeric=False):
+            if p_len < start + length: return "N/A"
+            raw = payload[start:start+length].decode(errors='ignore')
+            if is_numeric: return raw.strip() 
+            return raw.strip()
+
+        # Safe conversion for money
+        def get_money(start, length):
+            try:
+                val_str = get_val(start, length, True)
+                if "N/A" in val_str: return "0.00"
+                val = int(val_str)
+                return "{:.2f}".format(val / 100)
+            except: return "0.00"
+        
+        # Parse Card Number: remove length prefix and padding
+        def format_card(raw):
+            if raw == "N/A" or len(raw) < 2: return raw
+            try:
+                c_len = int(raw[:2])
+                return raw[2:2+c_len] # Return readable
+            except: return raw
+
+        # Parse Card Scheme Code (Index 31-33)
+        # User request: Show "08 (MyDebit)" format
+        raw_type_code = "11"
+        if p_len >= 33:
+            raw_type_code = payload[31:33].decode(errors='ignore')
+        
+        card_name_str = cls.CARD_TYPES.get(raw_type_code, "UNKNOWN")
+        display_card_type = f"{raw_type_code} ({card_name_str})"
+
+        # --- DATA MAPPING based on Source 254 ---
+        d_dict = {
+            "type": "SALE", 
+            "card":         format_card(get_val(5, 22).replace('X', '*')), 
+            "expiry":       get_val(27, 4),
+            
+            # Shows Number + Name
+            "card_scheme":  display_card_type, 
+            
+            "auth":         get_val(33, 8),
+            "amount":       get_money(41, 12),
+            "net_amount":   get_money(53, 12), # Added Net Amount
+            
+            # Protocol Byte 65 = Trace Number = Bank Sim "STAN"
+            "stan":         get_val(65, 6), 
+            # Protocol Byte 71 = Invoice Number = Bank Sim "Inv Num" (Trace on receipt)
+            "invoice":      get_val(71, 6), 
+
+            "cashier":      get_val(77, 4),
+            "card_name":    get_val(81, 15), 
+            "terminal_id":  get_val(96, 8),   
+            "merchant_id":  get_val(104, 15),
+            "batch":        get_val(119, 6, True)
+        }
+        return d_dict
+
     def show_receipt(self, data):
         # Spec 4.2 [cite: 254]
         try:
@@ -458,64 +807,7 @@ class POSApp:
             if p_len < 125:
                 self.log("WARN: Payload < 125. Firmware may be pre-v1.0.17", "err")
 
-            # Helper to safely extract fields even if packet is short
-            def get_val(start, length, is_numeric=False):
-                if p_len < start + length: return "N/A"
-                raw = payload[start:start+length].decode(errors='ignore')
-                if is_numeric: return raw.strip() 
-                return raw.strip()
-
-            # Safe conversion for money
-            def get_money(start, length):
-                try:
-                    val_str = get_val(start, length, True)
-                    if "N/A" in val_str: return "0.00"
-                    val = int(val_str)
-                    return "{:.2f}".format(val / 100)
-                except: return "0.00"
-            
-            # Parse Card Number: remove length prefix and padding
-            def format_card(raw):
-                if raw == "N/A" or len(raw) < 2: return raw
-                try:
-                    c_len = int(raw[:2])
-                    return raw[2:2+c_len] # Return readable
-                except: return raw
-
-            # Parse Card Scheme Code (Index 31-33)
-            # User request: Show "08 (MyDebit)" format
-            raw_type_code = "11"
-            if p_len >= 33:
-                raw_type_code = payload[31:33].decode(errors='ignore')
-            
-            card_name_str = self.CARD_TYPES.get(raw_type_code, "UNKNOWN")
-            display_card_type = f"{raw_type_code} ({card_name_str})"
-
-            # --- DATA MAPPING based on Source 254 ---
-            d_dict = {
-                "type": "SALE", 
-                "card":         format_card(get_val(5, 22).replace('X', '*')), 
-                "expiry":       get_val(27, 4),
-                
-                # Shows Number + Name
-                "card_scheme":  display_card_type, 
-                
-                "auth":         get_val(33, 8),
-                "amount":       get_money(41, 12),
-                "net_amount":   get_money(53, 12), # Added Net Amount
-                
-                # Protocol Byte 65 = Trace Number = Bank Sim "STAN"
-                "stan":         get_val(65, 6), 
-                # Protocol Byte 71 = Invoice Number = Bank Sim "Inv Num" (Trace on receipt)
-                "invoice":      get_val(71, 6), 
-
-                "cashier":      get_val(77, 4),
-                "card_name":    get_val(81, 15), 
-                "terminal_id":  get_val(96, 8),   
-                "merchant_id":  get_val(104, 15),
-                "batch":        get_val(119, 6, True)
-            }
-
+            d_dict = self.receipt_fields(payload)
             ReceiptPopup(self.root, d_dict)
             
         except Exception as e: 
@@ -555,6 +847,7 @@ class POSApp:
                 self.btn_conn.config(text="DISCONNECT", style="Cancel.TButton")
                 self.cb_port.config(state="disabled")
                 self.cv_status.itemconfig(self.status_dot, fill="#00C853")
+                self.prober.probe_now(self.port_var.get())
                 self.save_settings() # Save on connect
             else:
                 self.log(f"Fail: {msg}", "err")
@@ -571,9 +864,22 @@ class POSApp:
         self.log(">>> STOP SIGNAL SENT <<<", "err")
 
     def tx(self, cmd):
-        if not self.proto.ser or not self.proto.ser.is_open:
+        if not self.proto.is_connected():
             messagebox.showwarning("Error", "Connect port first.")
             return
+        if self.proto.in_flight:
+            messagebox.showwarning("Busy", "Terminal is busy, try again in a moment.")
+            return
+
+        # Fail fast instead of making the customer wait out the timeout
+        health = self.prober.get(self.port_var.get())
+        if health["state"] == "down":
+            seen = datetime.fromtimestamp(health["last_seen"]).strftime("%H:%M:%S") if health.get("last_seen") else "never"
+            if not messagebox.askyesno("Terminal Not Responding",
+                                       f"Health checks are failing: {health.get('detail', '')}\n"
+                                       f"Last seen: {seen}\n\nCheck the terminal is docked and online.\n"
+                                       "Send anyway?", icon="warning", default="no"):
+                return
         
         try:
             # Logic based on Message Format
@@ -582,6 +888,14 @@ class POSApp:
             cshr = self.ent_csh.get()
             
             pkt = self.proto.build_packet(cmd, amt, inv, cshr)
+
+            # Retry protection: key on what the cashier sees, the invoice box included
+            key = None
+            if cmd in IDEMPOTENT_CMDS:
+                key = (self.port_var.get(), cmd, int(round(self.ent_amt.get_amount() * 100)), cshr.strip(), self.ent_inv.get().strip())
+                if not self.check_retry(key):
+                    return
+                self.txn_cache.begin(key)
             
             self.btn_cancel.config(state="normal")
             
@@ -590,15 +904,61 @@ class POSApp:
             elif cmd == "050": self.show_toast("Settlement In Progress...", COL_SETTLE)
             
             self.save_settings() # Save invoice/cashier before sending
-            self.proto.send_recv(pkt, self.on_resp)
+            self.proto.send_recv(pkt, lambda msg, data: self.on_resp(msg, data, key))
         except ValueError:
             messagebox.showerror("Error", "Check inputs.")
 
-    def on_resp(self, msg, data):
+    def check_retry(self, key):
+        # True when it is safe to send; may instead replay a known result
+        entry = self.txn_cache.get(key)
+        if entry is None or entry["state"] == "declined":
+            return True
+        when = datetime.fromtimestamp(entry["ts"]).strftime("%H:%M:%S")
+
+        if entry["state"] == "pending":
+            messagebox.showwarning("In Progress", "This transaction is still waiting for the terminal.")
+            return False
+
+        if entry["state"] == "approved":
+            if messagebox.askyesno("Already Approved",
+                                   f"An identical transaction was APPROVED at {when}.\n\n"
+                                   "Show that receipt instead of charging the card again?"):
+                self.log(f"Retry blocked: replaying approved result from {when}")
+                self.show_receipt(entry["data"])
+                return False
+            # Declining the replay is not consent to a second charge
+            if not messagebox.askyesno("Charge Again?",
+                                       f"The customer was already charged at {when}.\n\n"
+                                       "Charge the customer AGAIN?", icon="warning", default="no"):
+                self.log(f"Retry cancelled: identical transaction approved at {when}")
+                return False
+        else:
+            # No answer last time: the card may or may not have been charged
+            if not messagebox.askyesno("Unconfirmed Transaction",
+                                       f"The identical request sent at {when} got no response.\n"
+                                       "The customer may already have been charged.\n\n"
+                                       "Check the last transaction on the terminal first.\n"
+                                       "Send a NEW request anyway?", icon="warning", default="no"):
+                return False
+
+        self.log(f"Retry override: re-sending request last seen at {when}", "err")
+        self.txn_cache.forget(key)
+        return True
+
+    def on_resp(self, msg, data, key=None):
         def update():
             self.btn_cancel.config(state="disabled")
             tag = "tx" if "TX" in msg else ("err" if "Err" in msg else "rx")
             self.log(msg, tag)
+
+            if key is not None and not msg.startswith("TX"):
+                if data and len(data) > 10:
+                    ok = data[4:6] == b"00" # Error code right after STX + cmd
+                    self.txn_cache.finish(key, "approved" if ok else "declined", data)
+                elif msg in ("Err: Disconnected", "Err: Terminal busy", "Err: Worker connection lost"):
+                    self.txn_cache.forget(key) # Never reached the terminal
+                else:
+                    self.txn_cache.finish(key, "unknown")
             
             if data and len(data) > 10:
                 try:
@@ -621,6 +981,26 @@ class POSApp:
         self.root.after(0, update)
 
 if __name__ == "__main__":
+    import argparse
+    import multiprocessing
+    multiprocessing.freeze_support() # Frozen (PyInstaller) builds spawning the worker
+    ap = argparse.ArgumentParser(description="GHL Terminal Simulator")
+    ap.add_argument("--worker", action="store_true", help="Run serial I/O in a separate worker process")
+    ap.add_argument("--attach", metavar="HOST:PORT", help="Attach to an already running serial worker")
+    ap.add_argument("--authkey", help="The shared worker's --authkey (with --attach)")
+    args = ap.parse_args()
+    if args.attach and not args.authkey:
+        ap.error("--attach needs the worker's --authkey")
+
+    proto = None
+    if args.worker or args.attach:
+        import GHL_Serial_Worker as worker
+        if args.attach:
+            proto = worker.WorkerProtocol(worker.parse_address(args.attach), args.authkey.encode())
+        else:
+            _, address, authkey = worker.start_worker()
+            proto = worker.WorkerProtocol(address, authkey)
+
     root = tk.Tk()
-    app = POSApp(root)
+    app = POSApp(root, proto)
     root.mainloop()